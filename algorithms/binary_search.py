@@ -3,19 +3,24 @@ from typing import TypeVar
 
 T = TypeVar("T")
 
-def binary_search(l: list[T], item: T) -> int:
+def binary_search(l: list[T], item: T, lo: int = 0, hi: int | None = None) -> int:
     """
     Utilise the binary search algorithm to find the index where a particular element would be stored.
 
+    Only l[lo:hi] is searched (the whole of l by default), so l can be any sequence
+    supporting __getitem__, such as a partially filled ArrayR.
+
     :return: The index at which either:
         * This item is located, or
         * Where this item would be inserted to preserve the ordering.
 
     :complexity:
     Best Case Complexity: O(1), when middle index contains item.
-    Worst Case Complexity: O(log(N)), where N is the length of l.
+    Worst Case Complexity: O(log(N)), where N is hi - lo.
     """
-    return _binary_search_aux(l, item, 0, len(l))
+    if hi is None:
+        hi = len(l)
+    return _binary_search_aux(l, item, lo, hi)
 
 def _binary_search_aux(l: list[T], item: T, lo: int, hi: int) -> int:
     """
@@ -23,15 +28,17 @@ def _binary_search_aux(l: list[T], item: T, lo: int, hi: int) -> int:
     lo: smallest index where the return value could be.
     hi: largest index where the return value could be.
     """
-    if lo == hi:
-        return lo
-    mid = (hi + lo) // 2
-    if l[mid] > item:
-        # Item would be before mid
-        return _binary_search_aux(l, item, lo, mid)
-    elif l[mid] < item:
-        # Item would be after mid
-        return _binary_search_aux(l, item, mid+1, hi)
-    elif l[mid] == item:
-        return mid
-    raise ValueError(f"Comparison operator poorly implemented {item} and {l[mid]} cannot be compared.")
+    while lo < hi:
+        mid = (hi + lo) // 2
+        value = l[mid]
+        if value > item:
+            # Item would be before mid
+            hi = mid
+        elif value < item:
+            # Item would be after mid
+            lo = mid + 1
+        elif value == item:
+            return mid
+        else:
+            raise ValueError(f"Comparison operator poorly implemented {item} and {value} cannot be compared.")
+    return lo
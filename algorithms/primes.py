@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+# Testing against these bases is deterministic for all n < 3.3 * 10^24.
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+def is_prime(n: int) -> bool:
+    """
+    Check whether n is prime using the Miller-Rabin test.
+
+    :complexity: O(log(n)^3)
+    """
+    if n < 2:
+        return False
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def next_prime(n: int) -> int:
+    """
+    Returns the smallest prime >= n.
+
+    :complexity: O(g * log(n)^3) where g is the gap to the next prime, O(log(n)) on average.
+    """
+    if n <= 2:
+        return 2
+    if n % 2 == 0:
+        n += 1
+    while not is_prime(n):
+        n += 2
+    return n
@@ -0,0 +1,86 @@
+"""
+Compare the recursive and iterative lookup and insert paths of BinarySearchTree at different depths.
+
+Usage:
+    python -m benchmarks.bench_bst [--depths 20 100 1000 10000] [--ops 1000] [--repeat 5] [--seed 1]
+
+For each depth D, a chain of D keys is built (sorted inserts, so every node is D deep),
+and --ops random keys larger than the chain are inserted below it, so each operation
+walks at least D levels. Times are in microseconds per operation:
+    * insert:  inserting the --ops keys, via insert_aux and via insert_iterative.
+    * lookup:  looking every key up, via get_tree_node_by_key_aux and get_tree_node_by_key,
+               repeated --repeat times.
+The recursion limit is raised so the recursive paths can reach the deepest nodes.
+"""
+__docformat__ = 'reStructuredText'
+
+import argparse
+import sys
+import time
+
+from data_structures.bst import BinarySearchTree
+from random_gen import RandomGen
+
+
+def chain(depth: int) -> BinarySearchTree:
+    tree = BinarySearchTree()
+    for key in range(depth):
+        tree.insert_iterative(key, key)
+    return tree
+
+
+def recursive_insert(tree: BinarySearchTree, keys: list[int]) -> None:
+    for key in keys:
+        tree.root = tree.insert_aux(tree.root, key, key)
+
+
+def iterative_insert(tree: BinarySearchTree, keys: list[int]) -> None:
+    for key in keys:
+        tree.insert_iterative(key, key)
+
+
+def recursive_lookup(tree: BinarySearchTree, keys: list[int]) -> None:
+    for key in keys:
+        tree.get_tree_node_by_key_aux(tree.root, key)
+
+
+def iterative_lookup(tree: BinarySearchTree, keys: list[int]) -> None:
+    for key in keys:
+        tree.get_tree_node_by_key(key)
+
+
+def time_us(fn, tree: BinarySearchTree, keys: list[int], repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(tree, keys)
+    return (time.perf_counter() - start) / (repeat * len(keys)) * 1e6
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--depths", type=int, nargs="+", default=[20, 100, 1000, 10_000])
+    p.add_argument("--ops", type=int, default=1000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    RandomGen.set_seed(args.seed)
+    print(f"{'depth':>8}{'rec insert':>12}{'iter insert':>12}{'speedup':>9}"
+          f"{'rec lookup':>12}{'iter lookup':>12}{'speedup':>9}")
+    for depth in args.depths:
+        # Random keys below the chain form a subtree of depth O(log ops) on average.
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), depth + 10 * args.ops.bit_length() + 1000))
+        keys = [depth + key for key in range(args.ops)]
+        RandomGen.random_shuffle(keys)
+
+        results = []
+        for insert, lookup in ((recursive_insert, recursive_lookup), (iterative_insert, iterative_lookup)):
+            tree = chain(depth)
+            results.append((time_us(insert, tree, keys), time_us(lookup, tree, keys, args.repeat)))
+        (rec_insert, rec_lookup), (iter_insert, iter_lookup) = results
+        print(f"{depth:>8}{rec_insert:>12.2f}{iter_insert:>12.2f}{rec_insert / iter_insert:>8.1f}x"
+              f"{rec_lookup:>12.2f}{iter_lookup:>12.2f}{rec_lookup / iter_lookup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare BPlusTree against BinarySearchTree as sorted maps.
+
+Usage:
+    python -m benchmarks.bench_btree [--sizes 100000 1000000] [--capacity 32] [--ranges 1000]
+                                     [--span 100] [--seed 1]
+
+For each size N, both trees are filled with N distinct keys in random order and timed on:
+    * insert:  the N inserts.
+    * lookup:  N successful lookups, in a different random order.
+    * scan:    a full in-order iteration.
+    * range:   --ranges range scans of --span consecutive keys each.
+    * delete:  deleting every key, in random order.
+Memory is measured on a separate build under tracemalloc: the size retained by the
+finished tree (excluding the keys and items themselves).
+"""
+__docformat__ = 'reStructuredText'
+
+import argparse
+import time
+import tracemalloc
+
+from data_structures.bplus_tree import BPlusTree
+from data_structures.bst import BinarySearchTree
+from random_gen import RandomGen
+
+
+def time_it(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def memory_mib(make_tree, keys: list[int]) -> float:
+    """ MiB retained by a tree of keys. """
+    tracemalloc.start()
+    tree = make_tree()
+    for key in keys:
+        tree[key] = key
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / 2**20
+
+
+def run(make_tree, keys: list[int], lookups: list[int], starts: list[int], span: int) -> list[float]:
+    tree = make_tree()
+    def insert():
+        for key in keys:
+            tree[key] = key
+    def lookup():
+        for key in lookups:
+            tree[key]
+    def scan():
+        for _ in tree:
+            pass
+    def ranges():
+        for start in starts:
+            for _ in tree.range_items(start, start + span - 1):
+                pass
+    def delete():
+        for key in lookups:
+            del tree[key]
+    times = [time_it(insert), time_it(lookup), time_it(scan), time_it(ranges), time_it(delete)]
+    return times + [memory_mib(make_tree, keys)]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    p.add_argument("--capacity", type=int, default=BPlusTree.NODE_CAPACITY)
+    p.add_argument("--ranges", type=int, default=1000)
+    p.add_argument("--span", type=int, default=100)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    RandomGen.set_seed(args.seed)
+    trees = {
+        "bst": BinarySearchTree,
+        f"b+tree({args.capacity})": lambda: BPlusTree(args.capacity),
+    }
+    print(f"{'tree':<14}{'N':>9}{'insert':>9}{'lookup':>9}{'scan':>9}{'range':>9}{'delete':>9}{'MiB':>9}")
+    for n in args.sizes:
+        keys = list(range(n))
+        RandomGen.random_shuffle(keys)
+        lookups = keys[:]
+        RandomGen.random_shuffle(lookups)
+        starts = [RandomGen.randint(0, max(0, n - args.span)) for _ in range(args.ranges)]
+        for name, make_tree in trees.items():
+            results = run(make_tree, keys, lookups, starts, args.span)
+            print(f"{name:<14}{n:>9}" + "".join(f"{r:>9.3f}" for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare LinearProbeTable against RobinHoodTable at fixed load factors.
+
+Usage:
+    python -m benchmarks.bench_hash_tables [--size 98317] [--loads 0.5 0.6 0.7 0.8 0.9] [--seed 1]
+
+For each load factor a table of the given (prime) size is filled to that load without
+resizing, then timed on:
+    * insert:  filling the table.
+    * hit:     looking up every key.
+    * miss:    looking up as many absent keys.
+    * delete:  deleting half of the keys.
+Mean and maximum probe distances of the filled table are reported alongside.
+"""
+__docformat__ = 'reStructuredText'
+
+import argparse
+import time
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.robin_hood_table import RobinHoodTable
+from random_gen import RandomGen
+
+
+def probe_distances(table: LinearProbeTable) -> tuple[float, int]:
+    """ Mean and max distance of the stored entries from their home slots. """
+    total = longest = 0
+    size = table.table_size
+    for position in range(size):
+        entry = table.array[position]
+        if entry is not None:
+            distance = (position - entry[2]) % size
+            total += distance
+            longest = max(longest, distance)
+    return total / max(1, len(table)), longest
+
+
+def time_it(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(table_class, size: int, load: float, keys: list[str], missing: list[str]) -> list[float]:
+    table = table_class(sizes=[size], hash_function=hash, max_load_factor=1.0)
+    n = int(size * load)
+    present = keys[:n]
+
+    def insert():
+        for i, key in enumerate(present):
+            table[key] = i
+
+    def hit():
+        for key in present:
+            table[key]
+
+    def miss():
+        for key in missing[:n]:
+            key in table
+
+    def delete():
+        for key in present[::2]:
+            del table[key]
+
+    results = [time_it(insert)]
+    mean_probe, max_probe = probe_distances(table)
+    results += [time_it(hit), time_it(miss), time_it(delete), mean_probe, max_probe]
+    return results
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--size", type=int, default=98317)
+    p.add_argument("--loads", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.8, 0.9])
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    RandomGen.set_seed(args.seed)
+    keys = [f"island-{RandomGen.random()}-{i}" for i in range(args.size)]
+    missing = [f"absent-{RandomGen.random()}-{i}" for i in range(args.size)]
+
+    columns = ("insert", "hit", "miss", "delete", "mean_d", "max_d")
+    print(f"{'table':<18}{'load':>6}" + "".join(f"{c:>10}" for c in columns))
+    for load in args.loads:
+        for table_class in (LinearProbeTable, RobinHoodTable):
+            results = run(table_class, args.size, load, keys, missing)
+            print(f"{table_class.__name__:<18}{load:>6.2f}" + "".join(f"{r:>10.3f}" for r in results))
+
+
+if __name__ == "__main__":
+    main()
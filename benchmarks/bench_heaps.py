@@ -0,0 +1,97 @@
+"""
+Compare MaxHeap against DaryHeap across heap sizes and operation mixes.
+
+Usage:
+    python -m benchmarks.bench_heaps [--sizes 1000 100000 1000000] [--arity 4] [--seed 1]
+
+Each mix is timed on a heap prefilled with N random priorities:
+    * build:   heapify N elements.
+    * fill:    N adds into an empty heap (starting capacity 1, so growth is included).
+    * drain:   N get_max calls.
+    * mixed:   N operations, half add and half get_max.
+    * replace: N replace_top calls (steady-state top-k style workload).
+"""
+__docformat__ = 'reStructuredText'
+
+import argparse
+import time
+
+from data_structures.dary_heap import DaryHeap
+from data_structures.heap import MaxHeap
+from data_structures.referential_array import ArrayR
+from random_gen import RandomGen
+
+
+def random_points(n: int) -> ArrayR[float]:
+    points = ArrayR(n)
+    for i in range(n):
+        points[i] = RandomGen.random_float()
+    return points
+
+
+def time_it(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_mixes(make_heap, heapify, points: ArrayR[float]) -> dict[str, float]:
+    n = len(points)
+    results = {}
+
+    results["build"] = time_it(lambda: heapify(points))
+
+    def fill():
+        heap = make_heap(1)
+        for i in range(n):
+            heap.add(points[i])
+    results["fill"] = time_it(fill)
+
+    heap = heapify(points)
+    def drain():
+        for _ in range(n):
+            heap.get_max()
+    results["drain"] = time_it(drain)
+
+    heap = heapify(points)
+    def mixed():
+        for i in range(n):
+            if i & 1:
+                heap.get_max()
+            else:
+                heap.add(points[i])
+    results["mixed"] = time_it(mixed)
+
+    heap = heapify(points)
+    def replace():
+        for i in range(n):
+            heap.replace_top(points[i] * 0.5)
+    results["replace"] = time_it(replace)
+    return results
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    p.add_argument("--arity", type=int, default=DaryHeap.DEFAULT_ARITY)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    RandomGen.set_seed(args.seed)
+    heaps = {
+        "MaxHeap": (MaxHeap, lambda pts: MaxHeap.heapify(pts)),
+        f"DaryHeap(d={args.arity})": (
+            lambda size: DaryHeap(size, d=args.arity),
+            lambda pts: DaryHeap.heapify(pts, d=args.arity),
+        ),
+    }
+    print(f"{'heap':<16}{'N':>10}" + "".join(f"{mix:>10}" for mix in ("build", "fill", "drain", "mixed", "replace")))
+    for n in args.sizes:
+        points = random_points(n)
+        for name, (make_heap, heapify) in heaps.items():
+            results = run_mixes(make_heap, heapify, points)
+            print(f"{name:<16}{n:>10}" + "".join(f"{t:>10.3f}" for t in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare a LinearProbeTable behind one global lock against a ShardedTable across thread counts.
+
+Usage:
+    python -m benchmarks.bench_sharded_table [--threads 1 2 4 8] [--ops 200000] [--keys 50000]
+                                             [--writes 0.1] [--shards 16] [--seed 1]
+
+Each run prefills the table with --keys keys, then splits --ops operations over the threads.
+Each operation is a write (set) with probability --writes and a lookup otherwise.
+Throughput is reported in thousands of operations per second.
+"""
+__docformat__ = 'reStructuredText'
+
+import argparse
+import threading
+import time
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.sharded_table import ShardedTable
+from random_gen import RandomGen
+
+
+class GlobalLockTable:
+    """ A LinearProbeTable with every access serialised by a single lock. """
+
+    def __init__(self) -> None:
+        self.table = LinearProbeTable(hash_function=hash)
+        self.lock = threading.Lock()
+
+    def __getitem__(self, key):
+        with self.lock:
+            return self.table[key]
+
+    def __setitem__(self, key, value) -> None:
+        with self.lock:
+            self.table[key] = value
+
+
+def make_workload(n_ops: int, keys: list[str], write_ratio: float) -> list[tuple[bool, str]]:
+    threshold = int(write_ratio * (1 << 32))
+    return [(RandomGen.random() < threshold, RandomGen.random_choice(keys)) for _ in range(n_ops)]
+
+
+def run(table, workload: list[tuple[bool, str]], n_threads: int) -> float:
+    chunks = [workload[i::n_threads] for i in range(n_threads)]
+
+    def worker(chunk):
+        for is_write, key in chunk:
+            if is_write:
+                table[key] = key
+            else:
+                table[key]
+
+    threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(workload) / (time.perf_counter() - start) / 1000
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--ops", type=int, default=200_000)
+    p.add_argument("--keys", type=int, default=50_000)
+    p.add_argument("--writes", type=float, default=0.1)
+    p.add_argument("--shards", type=int, default=ShardedTable.DEFAULT_SHARDS)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    RandomGen.set_seed(args.seed)
+    keys = [f"island-{i}" for i in range(args.keys)]
+    workload = make_workload(args.ops, keys, args.writes)
+    tables = {
+        "global lock": GlobalLockTable,
+        f"sharded({args.shards})": lambda: ShardedTable(args.shards),
+    }
+    print(f"{'table':<16}{'threads':>8}{'kops/s':>10}")
+    for n_threads in args.threads:
+        for name, make_table in tables.items():
+            table = make_table()
+            for key in keys:
+                table[key] = key
+            print(f"{name:<16}{n_threads:>8}{run(table, workload, n_threads):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+""" AVL Tree.
+    Defines a self-balancing Binary Search Tree, built on AVLTreeNode.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Generic
+from data_structures.bst import BinarySearchTree, K, I
+from data_structures.node import AVLTreeNode
+
+
+class AVLTree(BinarySearchTree[K, I], Generic[K, I]):
+    """ Self-balancing binary search tree using the AVL algorithm.
+
+        Every node keeps the height of its subtree, and after each insertion or
+        deletion the nodes on the path back to the root are rotated as needed so
+        that the heights of any node's two subtrees differ by at most one.
+        The depth of the tree is therefore O(log N) whatever order keys arrive in.
+        Insertion and deletion (including insert_iterative and delete_iterative) go
+        through the recursive *_aux methods, which rebalance on the way back up.
+    """
+
+    def __setitem__(self, key: K, item: I) -> None:
+        self.root = self.insert_aux(self.root, key, item)
+
+    def __delitem__(self, key: K) -> None:
+        self.root = self.delete_aux(self.root, key)
+
+    def insert_iterative(self, key: K, item: I) -> None:
+        """ Insert through insert_aux, as __setitem__ does: the tree must be rebalanced on the way up. """
+        self[key] = item
+
+    def delete_iterative(self, key: K) -> None:
+        """ Delete through delete_aux, as __delitem__ does: the tree must be rebalanced on the way up. """
+        del self[key]
+
+    def _new_node(self, key: K, item: I) -> AVLTreeNode:
+        """ Create a node of the type this tree is made of. """
+        return AVLTreeNode(key, item)
+
+    def _build_balanced(self, pairs: list[tuple[K, I]], lo: int, hi: int) -> AVLTreeNode:
+        """
+            Build a balanced sub-tree from pairs[lo:hi], setting its heights, and return its root.
+            :complexity: O(hi - lo)
+        """
+        current = super()._build_balanced(pairs, lo, hi)
+        if current is not None:
+            self.update_height(current)
+        return current
+
+    def get_height(self, current: AVLTreeNode) -> int:
+        """
+            Get the height of a node. Return current.height if current is
+            not None. Otherwise, return 0.
+            :complexity: O(1)
+        """
+        if current is not None:
+            return current.height
+        return 0
+
+    def get_balance(self, current: AVLTreeNode) -> int:
+        """
+            Compute the balance factor for the current sub-tree as the value
+            (right.height - left.height). If current is None, return 0.
+            :complexity: O(1)
+        """
+        if current is None:
+            return 0
+        return self.get_height(current.right) - self.get_height(current.left)
+
+    def update_height(self, current: AVLTreeNode) -> None:
+        """
+            Recompute the height of current from the heights of its children.
+            :complexity: O(1)
+        """
+        current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
+
+    def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
+        """
+            Attempts to insert an item into the tree, it uses the Key to insert it,
+            rebalancing on the way back up.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+            CompK is the complexity of comparing the keys
+        """
+        if current is None:  # base case: at the leaf
+            current = self._new_node(key, item)
+            self.length += 1
+            return current
+        elif key < current.key:
+            current.left = self.insert_aux(current.left, key, item)
+        elif key > current.key:
+            current.right = self.insert_aux(current.right, key, item)
+        else:  # key == current.key
+            raise ValueError('Inserting duplicate item')
+        current.size += 1
+        return self.rebalance(current)
+
+    def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
+        """
+            Attempts to delete an item from the tree, it uses the Key to
+            determine the node to delete, rebalancing on the way back up.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+        """
+        current = super().delete_aux(current, key)
+        if current is None:
+            return None
+        return self.rebalance(current)
+
+    def _join_with_key(self, left: AVLTreeNode, current: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+            Join left, current and right into a balanced sub-tree: current is attached
+            where the spine of the taller sub-tree reaches the height of the shorter one,
+            and the nodes above it are rebalanced on the way back up.
+            :complexity: O(|height(left) - height(right)| + 1)
+        """
+        left_height, right_height = self.get_height(left), self.get_height(right)
+        if left_height > right_height + 1:
+            left.right = self._join_with_key(left.right, current, right)
+            left.size = 1 + self.get_size(left.left) + self.get_size(left.right)
+            return self.rebalance(left)
+        if right_height > left_height + 1:
+            right.left = self._join_with_key(left, current, right.left)
+            right.size = 1 + self.get_size(right.left) + self.get_size(right.right)
+            return self.rebalance(right)
+        current = super()._join_with_key(left, current, right)
+        self.update_height(current)
+        return current
+
+    def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Perform left rotation of the sub-tree.
+            Right child of the current node, i.e. of the root of the target
+            sub-tree, should become the new root of the sub-tree.
+            returns the new root of the subtree.
+            Example:
+
+                 current                                       child
+                /       \\                                      /     \\
+            l-tree     child           -------->        current     r-tree
+                      /     \\                           /     \\
+                 center     r-tree                 l-tree     center
+
+            :complexity: O(1)
+        """
+        child = current.right
+        current.right = child.left
+        child.left = current
+        child.size = current.size
+        current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+        self.update_height(current)
+        self.update_height(child)
+        return child
+
+    def right_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Perform right rotation of the sub-tree.
+            Left child of the current node, i.e. of the root of the target
+            sub-tree, should become the new root of the sub-tree.
+            returns the new root of the subtree.
+            Example:
+
+                       current                                child
+                      /       \\                              /     \\
+                  child       r-tree     --------->     l-tree     current
+                 /     \\                                           /     \\
+            l-tree     center                                 center     r-tree
+
+            :complexity: O(1)
+        """
+        child = current.left
+        current.left = child.right
+        child.right = current
+        child.size = current.size
+        current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+        self.update_height(current)
+        self.update_height(child)
+        return child
+
+    def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Compute the balance of the current node.
+            Do rebalancing of the sub-tree of this node if necessary.
+            Rebalancing should be done either by:
+            - one left rotate
+            - one right rotate
+            - a combination of left + right rotate
+            - a combination of right + left rotate
+            returns the new root of the subtree.
+            :complexity: O(1)
+        """
+        self.update_height(current)
+        balance = self.get_balance(current)
+        if balance >= 2:
+            if self.get_balance(current.right) < 0:
+                current.right = self.right_rotate(current.right)
+            return self.left_rotate(current)
+
+        if balance <= -2:
+            if self.get_balance(current.left) > 0:
+                current.left = self.left_rotate(current.left)
+            return self.right_rotate(current)
+
+        return current
@@ -0,0 +1,135 @@
+"""
+    Bit-vector implementation of Set ADT, for sets of small non-negative integers.
+"""
+
+from __future__ import annotations
+import sys
+from typing import Iterator
+from data_structures.set import Set
+from data_structures.typed_array import ArrayU
+
+
+class BitSet(Set[int]):
+    """Set of the integers in range(universe), one bit per possible element.
+
+    Attributes:
+        * universe (int): elements must satisfy 0 <= item < universe
+        * words (ArrayU): bit item % 64 of words[item // 64] is set if item is in the set
+        * size (int): number of elements in the set
+
+    add, remove and membership are O(1). Set algebra works on whole words at a time:
+    the word arrays are read as Python integers through the buffer protocol, combined
+    with a single |, & or & ~ (which runs over 64-bit digits in C), and written back,
+    so union, intersection and difference cost O(universe / 64) with no per-element work.
+    """
+
+    WORD_BITS = 64
+
+    def __init__(self, universe: int) -> None:
+        """ Initialization, for elements from 0 to universe - 1.
+        :complexity: O(universe / 64)
+        :raises ValueError: if universe is not positive.
+        """
+        if universe <= 0:
+            raise ValueError("A bit set needs a positive universe.")
+        self.universe = universe
+        Set.__init__(self)
+
+    @classmethod
+    def _from_int(cls, universe: int, bits: int) -> BitSet:
+        """ Create a set from a Python integer whose bit i is set when i is in the set. """
+        res = cls(universe)
+        memoryview(res.words).cast("B")[:] = bits.to_bytes(len(res.words) * 8, "little")
+        if sys.byteorder != "little":
+            res.words.byteswap()
+        res.size = bits.bit_count()
+        return res
+
+    def _to_int(self) -> int:
+        """ The set as a Python integer whose bit i is set when i is in the set. """
+        if sys.byteorder == "little":
+            return int.from_bytes(self.words, "little")
+        words = self.words.__copy__()
+        words.byteswap()
+        return int.from_bytes(words, "little")
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the set. """
+        return self.size
+
+    def is_empty(self) -> bool:
+        """ True if the set is empty. """
+        return len(self) == 0
+
+    def clear(self) -> None:
+        """ Makes the set empty. """
+        self.words = ArrayU((self.universe + self.WORD_BITS - 1) // self.WORD_BITS)
+        self.size = 0
+
+    def __contains__(self, item: int) -> bool:
+        """ True if the set contains the item.
+        :complexity: O(1)
+        """
+        if not 0 <= item < self.universe:
+            return False
+        return (self.words[item >> 6] >> (item & 63)) & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        """ Yields the elements of the set in increasing order, skipping empty words.
+        :complexity: O(universe / 64 + n) where n is the size of the set.
+        """
+        for index, word in enumerate(self.words):
+            base = index * self.WORD_BITS
+            while word:
+                lowest = word & -word
+                yield base + lowest.bit_length() - 1
+                word ^= lowest
+
+    def add(self, item: int) -> None:
+        """ Adds an element to the set. An element already present in the set is not added again.
+        :complexity: O(1)
+        :raises ValueError: if item is not in range(universe).
+        """
+        if not 0 <= item < self.universe:
+            raise ValueError("{0} is outside the universe of this set.".format(item))
+        word, bit = item >> 6, 1 << (item & 63)
+        if not self.words[word] & bit:
+            self.words[word] |= bit
+            self.size += 1
+
+    def remove(self, item: int) -> None:
+        """ Removes an element from the set.
+        :pre: the element should be present in the set
+        :raises KeyError: if no such element is found.
+        """
+        if item not in self:
+            raise KeyError(item)
+        self.words[item >> 6] &= ~(1 << (item & 63)) & 0xFFFFFFFFFFFFFFFF
+        self.size -= 1
+
+    def union(self, other: BitSet) -> BitSet:
+        """ Creates a new set equal to the union with another one,
+        i.e. the result set should contains the elements of self and other.
+        :complexity: O(universe / 64)
+        """
+        return self._from_int(max(self.universe, other.universe), self._to_int() | other._to_int())
+
+    def intersection(self, other: BitSet) -> BitSet:
+        """ Creates a new set equal to the intersection with another one,
+        i.e. the result set should contain the elements that are both in
+        self *and* other.
+        :complexity: O(universe / 64)
+        """
+        return self._from_int(min(self.universe, other.universe), self._to_int() & other._to_int())
+
+    def difference(self, other: BitSet) -> BitSet:
+        """ Creates a new set equal to the difference with another one,
+        i.e. the result set should contain the elements of self that
+        *are not* in other.
+        :complexity: O(universe / 64)
+        """
+        return self._from_int(self.universe, self._to_int() & ~other._to_int())
+
+    def __str__(self):
+        """ Magic method constructing a string representation of the set object. """
+        return '{' + ', '.join(str(item) for item in self) + '}'
@@ -0,0 +1,317 @@
+""" B+ Tree.
+    Defines a sorted map stored in a B+ tree: every node holds many keys in a Python
+    list, items are only stored in the leaves, and the leaves are linked in key order.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Generic, Iterator, TypeVar
+from algorithms.binary_search import binary_search
+from data_structures.node import TreeNode
+
+# generic types
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class BPlusLeaf(Generic[K, I]):
+    """ Leaf of a B+ tree: sorted keys with their items, and the next leaf. """
+
+    def __init__(self, keys: list[K] | None = None, items: list[I] | None = None) -> None:
+        """
+            keys and items are stored as given, not copied.
+            :complexity: O(1)
+        """
+        self.keys: list[K] = keys if keys is not None else []
+        self.items: list[I] = items if items is not None else []
+        self.next: BPlusLeaf[K, I] | None = None
+
+
+class BPlusInternal(Generic[K]):
+    """
+        Internal node of a B+ tree: separator keys and one more child than keys.
+        Child i holds the keys smaller than keys[i], and child i + 1 the keys >= keys[i].
+    """
+
+    def __init__(self, keys: list[K], children: list[BPlusLeaf | BPlusInternal]) -> None:
+        """
+            keys and children are stored as given, not copied.
+            :complexity: O(1)
+        """
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree(Generic[K, I]):
+    """ Sorted map stored in a B+ tree.
+
+        Has the mapping interface of BinarySearchTree: inserting an existing key or
+        deleting a missing key raises ValueError, getting a missing key raises KeyError,
+        and iterating yields a TreeNode per key, in key order.
+
+        Each node holds up to node_capacity keys in a list, searched with binary_search,
+        so a tree of N keys is only about log(N) / log(node_capacity) nodes deep, and a
+        million keys need tens of thousands of nodes rather than a million. Every node
+        other than the root stays at least half full. Iteration and range scans walk the
+        linked leaves, without going back up the tree.
+
+        Keys and items are kept in plain lists rather than ArrayR blocks: an ArrayR keeps
+        every stored reference alive with an entry in a dict of its own, which costs more
+        per key than the TreeNode a BinarySearchTree allocates, while a list slot is one
+        pointer, and inserting into or removing from the middle of a list is a single
+        memmove.
+    """
+
+    NODE_CAPACITY = 32
+
+    def __init__(self, node_capacity: int = NODE_CAPACITY) -> None:
+        """
+            Initialises an empty B+ tree.
+            :complexity: O(1)
+            :raises ValueError: if node_capacity < 3.
+        """
+        if node_capacity < 3:
+            raise ValueError("A B+ tree node must hold at least 3 keys.")
+        self.node_capacity = node_capacity
+        self.min_count = node_capacity // 2
+        self.root: BPlusLeaf[K, I] | BPlusInternal[K] = BPlusLeaf()
+        self.length = 0
+
+    def is_empty(self) -> bool:
+        """
+            Checks to see if the tree is empty
+            :complexity: O(1)
+        """
+        return self.length == 0
+
+    def __len__(self) -> int:
+        """ Returns the number of keys in the tree. """
+        return self.length
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks to see if the key is in the tree
+            :complexity: see __getitem__
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def _child_index(self, node: BPlusInternal[K], key: K) -> int:
+        """
+            Index of the child of node whose keys range covers key.
+            :complexity: O(CompK * log(node_capacity))
+        """
+        keys = node.keys
+        index = binary_search(keys, key)
+        if index < len(keys) and keys[index] == key:
+            return index + 1
+        return index
+
+    def _find_leaf(self, key: K) -> BPlusLeaf[K, I]:
+        """
+            Leaf whose keys range covers key.
+            :complexity: O(CompK * log(N)) where N is the number of keys
+        """
+        node = self.root
+        while isinstance(node, BPlusInternal):
+            node = node.children[self._child_index(node, key)]
+        return node
+
+    def __getitem__(self, key: K) -> I:
+        """
+            Get the item stored with key.
+            :complexity: O(CompK * log(N)) where N is the number of keys
+            :raises KeyError: if the key is not in the tree.
+        """
+        leaf = self._find_leaf(key)
+        index = binary_search(leaf.keys, key)
+        if index < len(leaf.keys) and leaf.keys[index] == key:
+            return leaf.items[index]
+        raise KeyError('Key not found: {0}'.format(key))
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Insert key with item, splitting full nodes on the way back up.
+            :complexity: O(CompK * log(N) + node_capacity) where N is the number of keys
+            :raises ValueError: if the key is already in the tree.
+        """
+        path = []
+        node = self.root
+        while isinstance(node, BPlusInternal):
+            index = self._child_index(node, key)
+            path.append((node, index))
+            node = node.children[index]
+
+        index = binary_search(node.keys, key)
+        if index < len(node.keys) and node.keys[index] == key:
+            raise ValueError('Inserting duplicate item')
+        node.keys.insert(index, key)
+        node.items.insert(index, item)
+        self.length += 1
+
+        while len(node.keys) > self.node_capacity:
+            separator, sibling = self._split(node)
+            if not path:
+                self.root = BPlusInternal([separator], [node, sibling])
+                return
+            node, index = path.pop()
+            node.keys.insert(index, separator)
+            node.children.insert(index + 1, sibling)
+
+    def _split(self, node: BPlusLeaf[K, I] | BPlusInternal[K]) -> tuple[K, BPlusLeaf[K, I] | BPlusInternal[K]]:
+        """
+            Move the upper half of an overflowing node into a new right sibling.
+            Returns the separator key for the parent, and the sibling.
+            A leaf keeps a copy of the separator (its sibling's first key), while an
+            internal node moves its middle key up.
+            :complexity: O(node_capacity)
+        """
+        mid = len(node.keys) // 2
+        if isinstance(node, BPlusLeaf):
+            sibling = BPlusLeaf(node.keys[mid:], node.items[mid:])
+            del node.keys[mid:]
+            del node.items[mid:]
+            sibling.next = node.next
+            node.next = sibling
+            return sibling.keys[0], sibling
+
+        separator = node.keys[mid]
+        sibling = BPlusInternal(node.keys[mid + 1:], node.children[mid + 1:])
+        del node.keys[mid:]
+        del node.children[mid + 1:]
+        return separator, sibling
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Delete key and its item. A node left less than half full borrows an entry
+            from a sibling, or is merged with one, on the way back up.
+            :complexity: O(CompK * log(N) + node_capacity) where N is the number of keys
+            :raises ValueError: if the key is not in the tree.
+        """
+        path = []
+        node = self.root
+        while isinstance(node, BPlusInternal):
+            index = self._child_index(node, key)
+            path.append((node, index))
+            node = node.children[index]
+
+        index = binary_search(node.keys, key)
+        if index >= len(node.keys) or node.keys[index] != key:
+            raise ValueError('Deleting non-existent item')
+        del node.keys[index]
+        del node.items[index]
+        self.length -= 1
+
+        while path and len(node.keys) < self.min_count:
+            parent, index = path.pop()
+            self._fix_underflow(parent, index)
+            node = parent
+
+        if isinstance(self.root, BPlusInternal) and not self.root.keys:
+            self.root = self.root.children[0]
+
+    def _fix_underflow(self, parent: BPlusInternal[K], index: int) -> None:
+        """
+            Refill parent.children[index], which is less than half full, by borrowing
+            from a sibling that can spare an entry, or else by merging with a sibling.
+            :complexity: O(node_capacity)
+        """
+        node = parent.children[index]
+        left = parent.children[index - 1] if index > 0 else None
+        right = parent.children[index + 1] if index < len(parent.keys) else None
+        if left is not None and len(left.keys) > self.min_count:
+            self._borrow_from_left(parent, index, left, node)
+        elif right is not None and len(right.keys) > self.min_count:
+            self._borrow_from_right(parent, index, node, right)
+        elif right is not None:
+            self._merge(parent, index, node, right)
+        else:
+            self._merge(parent, index - 1, left, node)
+
+    def _borrow_from_left(self, parent: BPlusInternal[K], index: int, left, node) -> None:
+        """ Move the last entry of left to the front of node, its right sibling. """
+        if isinstance(node, BPlusLeaf):
+            node.keys.insert(0, left.keys.pop())
+            node.items.insert(0, left.items.pop())
+            parent.keys[index - 1] = node.keys[0]
+        else:
+            node.keys.insert(0, parent.keys[index - 1])
+            node.children.insert(0, left.children.pop())
+            parent.keys[index - 1] = left.keys.pop()
+
+    def _borrow_from_right(self, parent: BPlusInternal[K], index: int, node, right) -> None:
+        """ Move the first entry of right to the end of node, its left sibling. """
+        if isinstance(node, BPlusLeaf):
+            node.keys.append(right.keys.pop(0))
+            node.items.append(right.items.pop(0))
+            parent.keys[index] = right.keys[0]
+        else:
+            node.keys.append(parent.keys[index])
+            node.children.append(right.children.pop(0))
+            parent.keys[index] = right.keys.pop(0)
+
+    def _merge(self, parent: BPlusInternal[K], index: int, left, right) -> None:
+        """
+            Append right, parent.children[index + 1], to left, parent.children[index],
+            and remove it and their separator from parent.
+        """
+        separator = parent.keys.pop(index)
+        del parent.children[index + 1]
+        if isinstance(left, BPlusLeaf):
+            left.keys.extend(right.keys)
+            left.items.extend(right.items)
+            left.next = right.next
+        else:
+            left.keys.append(separator)
+            left.keys.extend(right.keys)
+            left.children.extend(right.children)
+
+    def _first_leaf(self) -> BPlusLeaf[K, I]:
+        node = self.root
+        while isinstance(node, BPlusInternal):
+            node = node.children[0]
+        return node
+
+    def __iter__(self) -> Iterator[TreeNode[K, I]]:
+        """
+            Yields a TreeNode for each key, in increasing key order, like the in-order
+            iterator of BinarySearchTree. The tree stores no nodes of its own, so these
+            are built on the fly: assigning to a yielded node's item does not update the tree.
+            :complexity: O(N) where N is the number of keys
+        """
+        for key, item in self.items():
+            yield TreeNode(key, item)
+
+    def items(self) -> Iterator[tuple[K, I]]:
+        """
+            Yields the (key, item) pairs in increasing key order, leaf by leaf.
+            :complexity: O(N) where N is the number of keys
+        """
+        leaf = self._first_leaf()
+        while leaf is not None:
+            yield from zip(leaf.keys, leaf.items)
+            leaf = leaf.next
+
+    def range_items(self, lo: K, hi: K) -> Iterator[tuple[K, I]]:
+        """
+            Lazily yields the (key, item) pairs with lo <= key <= hi, in key order:
+            finds the leaf of lo, then follows the leaf links.
+            :complexity: O(CompK * (log(N) + R)) where N is the number of keys
+            and R is the number of pairs yielded
+        """
+        leaf = self._find_leaf(lo)
+        index = binary_search(leaf.keys, lo)
+        while leaf is not None:
+            keys, items = leaf.keys, leaf.items
+            for i in range(index, len(keys)):
+                if hi < keys[i]:
+                    return
+                yield keys[i], items[i]
+            leaf = leaf.next
+            index = 0
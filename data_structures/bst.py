@@ -8,8 +8,8 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
-from typing import TypeVar, Generic
-from data_structures.linked_stack import LinkedStack
+from typing import TypeVar, Generic, Iterable, Iterator
+from algorithms.mergesort import mergesort
 from data_structures.node import TreeNode
 import sys
 
@@ -22,16 +22,16 @@ T = TypeVar('T')
 
 class BSTPreOrderIterator:
     """ Pre-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, on a list used as the stack,
+        so pushing a node does not allocate anything.
     """
 
     def __init__(self, root: TreeNode[K, I]) -> None:
         """ Iterator initialiser. """
 
-        self.stack = LinkedStack()
-        self.stack.push(root)
+        self.stack = [root] if root is not None else []
 
-    def __iter__(self) -> BSTInOrderIterator:
+    def __iter__(self) -> BSTPreOrderIterator:
         """ Standard __iter__() method for initialisers. Returns itself. """
 
         return self
@@ -41,27 +41,45 @@ class BSTPreOrderIterator:
             Returns keys of the BST one by one respecting the pre-order.
         """
 
-        if self.stack.is_empty():
+        if not self.stack:
             raise StopIteration
         current = self.stack.pop()
-        if current.right:
-            self.stack.push(current.right)
-        if current.left:
-            self.stack.push(current.left)
+        if current.right is not None:
+            self.stack.append(current.right)
+        if current.left is not None:
+            self.stack.append(current.left)
         return current
 
 
 class BSTInOrderIterator:
     """ In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, on a list used as the stack.
+        The stack holds the nodes whose left sub-tree is being visited.
     """
 
     def __init__(self, root: TreeNode[K, I]) -> None:
         """ Iterator initialiser. """
 
-        self.stack = LinkedStack()
+        self.stack = []
         self.current = root
 
+    @classmethod
+    def starting_from(cls, root: TreeNode[K, I], key: K) -> BSTInOrderIterator:
+        """ Create an iterator that starts at the first node whose key is >= key.
+            Only the search path for key is visited to get there.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+
+        iterator = cls(None)
+        current = root
+        while current is not None:
+            if current.key < key:
+                current = current.right
+            else:
+                iterator.stack.append(current)
+                current = current.left
+        return iterator
+
     def __iter__(self) -> BSTInOrderIterator:
         """ Standard __iter__() method for initialisers. Returns itself. """
 
@@ -72,14 +90,17 @@ class BSTInOrderIterator:
             Returns keys of the BST one by one respecting the in-order.
         """
 
-        while self.current:
-            self.stack.push(self.current)
-            self.current = self.current.left
+        current = self.current
+        stack = self.stack
+        while current is not None:
+            stack.append(current)
+            current = current.left
 
-        if self.stack.is_empty():
+        if not stack:
+            self.current = None
             raise StopIteration
 
-        result = self.stack.pop()
+        result = stack.pop()
         self.current = result.right
 
         return result
@@ -87,16 +108,19 @@ class BSTInOrderIterator:
 
 class BSTPostOrderIterator:
     """ Post-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, on a list used as the stack.
+        A node is returned once its right sub-tree is done, which is the case when
+        the previously returned node is its right child (or it has none).
     """
 
     def __init__(self, root: TreeNode[K, I]) -> None:
         """ Iterator initialiser. """
 
-        self.stack = LinkedStack()
-        self.stack.push((root, False))
+        self.stack = []
+        self.current = root
+        self.last = None
 
-    def __iter__(self) -> BSTInOrderIterator:
+    def __iter__(self) -> BSTPostOrderIterator:
         """ Standard __iter__() method for initialisers. Returns itself. """
 
         return self
@@ -106,22 +130,36 @@ class BSTPostOrderIterator:
             Returns keys of the BST one by one respecting the post-order.
         """
 
+        stack = self.stack
+        current = self.current
         while True:
-            if self.stack.is_empty():
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            if not stack:
+                self.current = None
                 raise StopIteration
-            current, expanded = self.stack.pop()
-            if expanded:
-                return current
+            top = stack[-1]
+            if top.right is not None and top.right is not self.last:
+                current = top.right
             else:
-                self.stack.push((current, True))
-                if current.right:
-                    self.stack.push((current.right, False))
-                if current.left:
-                    self.stack.push((current.left, False))
+                stack.pop()
+                self.current = None
+                self.last = top
+                return top
 
 
 class BinarySearchTree(Generic[K, I]):
-    """ Basic binary search tree. """
+    """ Basic binary search tree.
+
+        Lookups, insertions and deletions walk down the tree iteratively, recording the
+        path from the root, so they are not limited by the recursion limit and pay no
+        call overhead per level. The recursive *_aux methods are kept: they behave the
+        same way and subclasses (such as AVLTree) build on them.
+
+        Every node also keeps the size of its subtree, which answers order-statistic
+        (kth, rank) and range queries in time proportional to the depth of the tree.
+    """
 
     def __init__(self) -> None:
         """
@@ -132,6 +170,52 @@ class BinarySearchTree(Generic[K, I]):
         self.root = None
         self.length = 0
 
+    @classmethod
+    def from_sorted(cls, items: Iterable[tuple[K, I]]) -> BinarySearchTree[K, I]:
+        """
+            Build a perfectly balanced tree from (key, item) pairs in increasing key order.
+            The middle pair becomes the root and each half is built the same way, so no
+            keys are compared apart from checking the order.
+            :complexity: O(N) where N is the number of pairs
+            :raises ValueError: if the keys are not strictly increasing.
+        """
+        pairs = list(items)
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                raise ValueError('Keys are not strictly increasing: {0}'.format(pairs[i][0]))
+        tree = cls()
+        tree.root = tree._build_balanced(pairs, 0, len(pairs))
+        tree.length = len(pairs)
+        return tree
+
+    @classmethod
+    def from_unsorted(cls, items: Iterable[tuple[K, I]]) -> BinarySearchTree[K, I]:
+        """
+            Build a perfectly balanced tree from (key, item) pairs in any order,
+            by sorting them with mergesort first.
+            :complexity: O(CompK * N * log(N)) where N is the number of pairs
+            :raises ValueError: if a key appears more than once.
+        """
+        return cls.from_sorted(mergesort(list(items), key=lambda pair: pair[0]))
+
+    def _build_balanced(self, pairs: list[tuple[K, I]], lo: int, hi: int) -> TreeNode:
+        """
+            Build a balanced sub-tree from pairs[lo:hi] and return its root.
+            :complexity: O(hi - lo)
+        """
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        current = self._new_node(*pairs[mid])
+        current.left = self._build_balanced(pairs, lo, mid)
+        current.right = self._build_balanced(pairs, mid + 1, hi)
+        current.size = hi - lo
+        return current
+
+    def _new_node(self, key: K, item: I) -> TreeNode:
+        """ Create a node of the type this tree is made of. """
+        return TreeNode(key, item)
+
     def is_empty(self) -> bool:
         """
             Checks to see if the bst is empty
@@ -160,6 +244,14 @@ class BinarySearchTree(Generic[K, I]):
         """ Create an in-order iterator. """
         return BSTInOrderIterator(self.root)
 
+    def iter_from(self, key: K) -> BSTInOrderIterator:
+        """
+            Create an in-order iterator starting at the first node whose key is >= key.
+            The key does not need to be in the tree, and smaller keys are never visited.
+            :complexity: O(CompK * D) to start, where D is the depth of the tree
+        """
+        return BSTInOrderIterator.starting_from(self.root, key)
+
     def __getitem__(self, key: K) -> I:
         """
             Attempts to get an item in the tree, it uses the Key to attempt to find it
@@ -170,7 +262,21 @@ class BinarySearchTree(Generic[K, I]):
         return self.get_tree_node_by_key(key).item
 
     def get_tree_node_by_key(self, key: K) -> TreeNode:
-        return self.get_tree_node_by_key_aux(self.root, key)
+        """
+            Iteratively find the node with the given key.
+            :complexity best: O(CompK) finds the item in the root of the tree
+            :complexity worst: O(CompK * D) item is not found, where D is the depth of the tree
+            :raises KeyError: if the key is not in the tree.
+        """
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
         if current is None:  # base case: empty
@@ -183,7 +289,40 @@ class BinarySearchTree(Generic[K, I]):
             return self.get_tree_node_by_key_aux(current.right, key)
 
     def __setitem__(self, key: K, item: I) -> None:
-        self.root = self.insert_aux(self.root, key, item)
+        self.insert_iterative(key, item)
+
+    def insert_iterative(self, key: K, item: I) -> None:
+        """
+            Insert an item into the tree without recursion, walking down from the root
+            while recording the search path.
+            :complexity best: O(CompK) inserts the item at the root.
+            :complexity worst: O(CompK * D) inserting at the bottom of the tree
+            where D is the depth of the tree
+            CompK is the complexity of comparing the keys
+            :raises ValueError: if the key is already in the tree.
+        """
+        path = []
+        current = self.root
+        while current is not None:
+            path.append(current)
+            if key < current.key:
+                current = current.left
+            elif key > current.key:
+                current = current.right
+            else:  # key == current.key
+                raise ValueError('Inserting duplicate item')
+        node = self._new_node(key, item)
+        if not path:
+            self.root = node
+        elif key < path[-1].key:
+            path[-1].left = node
+        else:
+            path[-1].right = node
+        # Only now that the node is linked are the sizes on its path updated, so a
+        # failed insert (a duplicate key, or a comparison raising) changes nothing.
+        for ancestor in path:
+            ancestor.size += 1
+        self.length += 1
 
     def insert_aux(self, current: TreeNode, key: K, item: I) -> TreeNode:
         """
@@ -194,18 +333,59 @@ class BinarySearchTree(Generic[K, I]):
             CompK is the complexity of comparing the keys
         """
         if current is None:  # base case: at the leaf
-            current = TreeNode(key, item)
+            current = self._new_node(key, item)
             self.length += 1
+            return current
         elif key < current.key:
             current.left = self.insert_aux(current.left, key, item)
         elif key > current.key:
             current.right = self.insert_aux(current.right, key, item)
         else:  # key == current.key
             raise ValueError('Inserting duplicate item')
+        current.size += 1
         return current
 
     def __delitem__(self, key: K) -> None:
-        self.root = self.delete_aux(self.root, key)
+        self.delete_iterative(key)
+
+    def delete_iterative(self, key: K) -> None:
+        """
+            Delete an item from the tree without recursion. Like delete_aux, a node with
+            two children takes the key and item of its successor, which is then unlinked.
+            :complexity best: O(CompK) deleting a root with at most one child.
+            :complexity worst: O(CompK * D) where D is the depth of the tree
+            :raises ValueError: if the key is not in the tree.
+        """
+        path = []
+        current = self.root
+        while current is not None and key != current.key:
+            path.append(current)
+            current = current.left if key < current.key else current.right
+        if current is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+
+        if current.left is not None and current.right is not None:
+            # general case => find a successor, and its parent
+            path.append(current)
+            succ = current.right
+            while succ.left is not None:
+                path.append(succ)
+                succ = succ.left
+            current.key = succ.key
+            current.item = succ.item
+            current = succ
+
+        # current has at most one child: splice it out.
+        child = current.left if current.left is not None else current.right
+        if not path:
+            self.root = child
+        elif path[-1].left is current:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        for ancestor in path:
+            ancestor.size -= 1
+        self.length -= 1
 
     def delete_aux(self, current: TreeNode, key: K) -> TreeNode:
         """
@@ -236,6 +416,7 @@ class BinarySearchTree(Generic[K, I]):
             current.item = succ.item
             current.right = self.delete_aux(current.right, succ.key)
 
+        current.size -= 1
         return current
 
     def get_successor(self, current: TreeNode) -> TreeNode:
@@ -255,9 +436,196 @@ class BinarySearchTree(Generic[K, I]):
         """
         if current is None:
             return None
-        if current.left is None:
-            return current
-        return self.get_minimal(current.left)
+        while current.left is not None:
+            current = current.left
+        return current
+
+    def get_size(self, current: TreeNode) -> int:
+        """
+            Get the number of nodes in the sub-tree rooted at current (0 if current is None).
+            :complexity: O(1)
+        """
+        if current is not None:
+            return current.size
+        return 0
+
+    def kth(self, k: int) -> TreeNode:
+        """
+            Get the node with the k-th smallest key, counting from 1.
+            :complexity: O(D) where D is the depth of the tree
+            :raises IndexError: if k is not between 1 and len(self).
+        """
+        if not 1 <= k <= self.length:
+            raise IndexError('k out of range: {0}'.format(k))
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if k <= left_size:
+                current = current.left
+            elif k == left_size + 1:
+                return current
+            else:
+                k -= left_size + 1
+                current = current.right
+
+    def rank(self, key: K) -> int:
+        """
+            Get the number of keys in the tree smaller than key.
+            The key does not need to be in the tree.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        return self._count_below(key, False)
+
+    def _count_below(self, key: K, inclusive: bool) -> int:
+        """
+            Count the keys smaller than key (or equal to it, if inclusive).
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        count = 0
+        current = self.root
+        while current is not None:
+            if key < current.key or (key == current.key and not inclusive):
+                current = current.left
+            else:
+                count += self.get_size(current.left) + 1
+                current = current.right
+        return count
+
+    def count_range(self, lo: K, hi: K) -> int:
+        """
+            Count the keys k with lo <= k <= hi.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        if hi < lo:
+            return 0
+        return self._count_below(hi, True) - self._count_below(lo, False)
+
+    def range_items(self, lo: K, hi: K) -> Iterator[tuple[K, I]]:
+        """
+            Lazily yields the (key, item) pairs with lo <= key <= hi, in key order.
+            Sub-trees entirely outside the range are never visited.
+            :complexity: O(CompK * (D + R)) where D is the depth of the tree
+            and R is the number of pairs yielded
+        """
+        stack = []
+        current = self.root
+        while True:
+            # Go down to the smallest key >= lo, remembering the nodes in range on the way.
+            while current is not None:
+                if current.key < lo:
+                    current = current.right
+                else:
+                    stack.append(current)
+                    current = current.left
+            if not stack:
+                return
+            current = stack.pop()
+            if hi < current.key:
+                return
+            yield current.key, current.item
+            current = current.right
+
+    def split(self, key: K) -> tuple[BinarySearchTree[K, I], BinarySearchTree[K, I]]:
+        """
+            Split the tree into a tree of the keys smaller than key, and a tree of the
+            keys >= key. The nodes are moved, not copied, so this tree is left empty.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        left_root, right_root = self._split_root(self.root, key, False)
+        self.root = None
+        self.length = 0
+        return self._tree_of(left_root), self._tree_of(right_root)
+
+    @classmethod
+    def join(cls, left: BinarySearchTree[K, I], right: BinarySearchTree[K, I]) -> BinarySearchTree[K, I]:
+        """
+            Join two trees, where every key of left is smaller than every key of right,
+            into one tree. The nodes are moved, not copied, so both trees are left empty.
+            :complexity: O(CompK * (D1 + D2)) where D1 and D2 are the depths of the trees
+            :raises ValueError: if some key of left is not smaller than some key of right.
+        """
+        tree = cls()
+        if left.root is not None and right.root is not None:
+            largest = left.root
+            while largest.right is not None:
+                largest = largest.right
+            if not largest.key < tree.get_minimal(right.root).key:
+                raise ValueError('Keys of the left tree must be smaller than keys of the right tree')
+        tree.root = tree._join_roots(left.root, right.root)
+        tree.length = tree.get_size(tree.root)
+        for joined in (left, right):
+            joined.root = None
+            joined.length = 0
+        return tree
+
+    def delete_range(self, lo: K, hi: K) -> None:
+        """
+            Delete every key k with lo <= k <= hi, by splitting off the range and joining
+            the rest back together. The deleted nodes are simply dropped.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        if hi < lo:
+            return
+        left_root, rest = self._split_root(self.root, lo, False)
+        deleted, right_root = self._split_root(rest, hi, True)
+        self.root = self._join_roots(left_root, right_root)
+        self.length -= self.get_size(deleted)
+
+    def _tree_of(self, root: TreeNode) -> BinarySearchTree[K, I]:
+        """ Create a tree of the same type as this one, holding the sub-tree root. """
+        tree = type(self)()
+        tree.root = root
+        tree.length = self.get_size(root)
+        return tree
+
+    def _split_root(self, root: TreeNode, key: K, inclusive: bool) -> tuple[TreeNode, TreeNode]:
+        """
+            Split the sub-tree root into the sub-trees of the keys smaller than key (or
+            equal to it, if inclusive) and of the other keys. Walks down the search path
+            for key, then back up it, joining each node and its off-path sub-tree onto
+            the side it belongs to.
+            :complexity: O(CompK * D) where D is the depth of the sub-tree
+        """
+        path = []
+        current = root
+        while current is not None:
+            path.append(current)
+            if key < current.key or (key == current.key and not inclusive):
+                current = current.left
+            else:
+                current = current.right
+
+        left = right = None
+        for current in reversed(path):
+            if key < current.key or (key == current.key and not inclusive):
+                right = self._join_with_key(right, current, current.right)
+            else:
+                left = self._join_with_key(current.left, current, left)
+        return left, right
+
+    def _join_roots(self, left: TreeNode, right: TreeNode) -> TreeNode:
+        """
+            Join two sub-trees, where every key of left is smaller than every key of right,
+            using the smallest node of right as the new root.
+            :complexity: O(CompK * D) where D is the depth of the deeper sub-tree
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        smallest, rest = self._split_root(right, self.get_minimal(right).key, True)
+        return self._join_with_key(left, smallest, rest)
+
+    def _join_with_key(self, left: TreeNode, current: TreeNode, right: TreeNode) -> TreeNode:
+        """
+            Make left and right the sub-trees of current, where the keys of left are smaller
+            than current.key and those of right are larger, and return the resulting sub-tree.
+            :complexity: O(1)
+        """
+        current.left = left
+        current.right = right
+        current.size = 1 + self.get_size(left) + self.get_size(right)
+        return current
 
     def is_leaf(self, current: TreeNode) -> bool:
         """ Simple check whether or not the node is a leaf. """
@@ -0,0 +1,229 @@
+"""d-ary Max Heap with numeric priorities stored apart from the payloads"""
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+from typing import Any, Callable, Generic
+from data_structures.referential_array import ArrayR, T
+from data_structures.typed_array import ArrayF
+
+
+class DaryHeap(Generic[T]):
+    """
+    d-ary Max Heap.
+
+    Has the same interface as MaxHeap, but every node has `d` children (4 by default),
+    so the tree is log(d) times shallower, and priorities are kept unboxed in an `ArrayF`
+    (`the_keys`) separate from the payloads in an ArrayR (`the_array`).
+    Sifting only reads the compact priority array, and the d children of a node are
+    adjacent in memory, so the largest child is found with a single C-level `max`.
+
+    Priorities must be numbers: key(element) if `key` is given, otherwise the element itself.
+    The array is 0-indexed; the children of k are d*k+1 .. d*k+d and its parent is (k-1)//d.
+    """
+    MIN_CAPACITY = 1
+    GROWTH_FACTOR = 2
+    SHRINK_THRESHOLD = 4
+    DEFAULT_ARITY = 4
+
+    def __init__(self, max_size: int, d: int = DEFAULT_ARITY, growable: bool = True,
+                 shrinkable: bool = False, key: Callable[[T], float] | None = None) -> None:
+        """
+        :raises ValueError: if d < 2.
+        :complexity: O(max_size)
+        """
+        if d < 2:
+            raise ValueError("A d-ary heap needs d >= 2.")
+        self.d = d
+        self.key = key
+        self.length = 0
+        capacity = max(self.MIN_CAPACITY, max_size)
+        self.the_keys = ArrayF(capacity)
+        self.the_array = ArrayR(capacity)
+        self.initial_capacity = capacity
+        self.growable = growable
+        self.shrinkable = shrinkable
+        self.grow_count = 0
+        self.shrink_count = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def capacity(self) -> int:
+        """ Number of elements the heap can hold before it has to resize. """
+        return len(self.the_array)
+
+    @property
+    def resize_count(self) -> int:
+        """ Total number of times the underlying arrays have been reallocated. """
+        return self.grow_count + self.shrink_count
+
+    def is_full(self) -> bool:
+        return self.length == len(self.the_array)
+
+    def _priority(self, element: T) -> float:
+        return float(element if self.key is None else self.key(element))
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Move the heap into arrays with room for new_capacity elements.
+        :pre: new_capacity >= self.length
+        :complexity: O(N) where N is len(self)
+        """
+        new_array = ArrayR(new_capacity)
+        new_array.copy_from(self.the_array, 0, 0, self.length)
+        self.the_array = new_array
+        if new_capacity > len(self.the_keys):
+            self.the_keys.extend(ArrayF(new_capacity - len(self.the_keys)))
+        else:
+            del self.the_keys[new_capacity:]
+
+    def rise(self, k: int) -> None:
+        """
+        Rise element at index k to its correct position
+        :pre: 0 <= k < self.length
+        :complexity: O(log_d N) where N is len(self)
+        """
+        keys, items, d = self.the_keys, self.the_array, self.d
+        key, item = keys[k], items[k]
+        while k > 0:
+            parent = (k - 1) // d
+            if keys[parent] >= key:
+                break
+            keys[k] = keys[parent]
+            items[k] = items[parent]
+            k = parent
+        keys[k] = key
+        items[k] = item
+
+    def largest_child(self, k: int) -> int:
+        """
+        Returns the index of k's child with greatest priority.
+        :pre: k has at least one child
+        :complexity: O(d)
+        """
+        first = self.d * k + 1
+        last = min(first + self.d, self.length)
+        return self.the_keys.index(max(self.the_keys[first:last]), first, last)
+
+    def sink(self, k: int) -> None:
+        """
+        Make the element at index k sink to the correct position.
+        :pre: 0 <= k < self.length
+        :complexity: O(d log_d N) where N is len(self)
+        """
+        keys, items, d, n = self.the_keys, self.the_array, self.d, self.length
+        key, item = keys[k], items[k]
+        while True:
+            first = d * k + 1
+            if first >= n:
+                break
+            last = min(first + d, n)
+            best_key = max(keys[first:last])
+            if best_key <= key:
+                break
+            child = keys.index(best_key, first, last)
+            keys[k] = best_key
+            items[k] = items[child]
+            k = child
+        keys[k] = key
+        items[k] = item
+
+    def add(self, element: T) -> None:
+        """
+        Add element with priority key(element).
+        :complexity: amortized O(log_d N), worst O(N) when the heap has to grow.
+        :raises IndexError: if the heap is full and not growable.
+        """
+        if self.is_full():
+            if not self.growable:
+                raise IndexError
+            self._resize(self.capacity * self.GROWTH_FACTOR)
+            self.grow_count += 1
+
+        self.the_keys[self.length] = self._priority(element)
+        self.the_array[self.length] = element
+        self.length += 1
+        self.rise(self.length - 1)
+
+    def peek(self) -> T:
+        """
+        Return the element with the greatest priority without removing it.
+        :raises IndexError: if the heap is empty.
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[0]
+
+    def get_max(self) -> T:
+        """
+        Remove (and return) the element with the greatest priority.
+        :complexity: O(d log_d N) where N is len(self)
+        :raises IndexError: if the heap is empty.
+        """
+        if self.length == 0:
+            raise IndexError
+
+        max_elt = self.the_array[0]
+        self.length -= 1
+        if self.length > 0:
+            self.the_keys[0] = self.the_keys[self.length]
+            self.the_array[0] = self.the_array[self.length]
+            self.sink(0)
+        self.the_array[self.length] = None
+        self._maybe_shrink()
+        return max_elt
+
+    def pushpop(self, element: T) -> T:
+        """
+        Add element, then remove and return the element with the greatest priority, using at most one sink.
+        :complexity: O(d log_d N) where N is len(self)
+        """
+        priority = self._priority(element)
+        if self.length == 0 or self.the_keys[0] <= priority:
+            return element
+        top = self.the_array[0]
+        self.the_keys[0] = priority
+        self.the_array[0] = element
+        self.sink(0)
+        return top
+
+    def replace_top(self, element: T) -> T:
+        """
+        Remove and return the element with the greatest priority, then add element, using a single sink.
+        :complexity: O(d log_d N) where N is len(self)
+        :raises IndexError: if the heap is empty.
+        """
+        if self.length == 0:
+            raise IndexError
+        top = self.the_array[0]
+        self.the_keys[0] = self._priority(element)
+        self.the_array[0] = element
+        self.sink(0)
+        return top
+
+    def _maybe_shrink(self) -> None:
+        """ Halve the capacity if the heap is shrinkable and at most a quarter full. """
+        if not self.shrinkable:
+            return
+        new_capacity = self.capacity // self.GROWTH_FACTOR
+        if new_capacity >= self.initial_capacity and self.length * self.SHRINK_THRESHOLD <= self.capacity:
+            self._resize(new_capacity)
+            self.shrink_count += 1
+
+    @classmethod
+    def heapify(cls, points: ArrayR[T], overwrite_size: int = 0, d: int = DEFAULT_ARITY,
+                key: Callable[[T], Any] | None = None) -> DaryHeap[T]:
+        """
+        Build a heap from the given points.
+        :complexity: O(N) where N is len(points)
+        """
+        self = cls(overwrite_size or len(points), d=d, key=key)
+        self.length = len(points)
+        self.the_array.copy_from(points, 0, 0, len(points))
+        keys, priority = self.the_keys, self._priority
+        for i, point in enumerate(points):
+            keys[i] = priority(point)
+        for k in range((self.length - 2) // d, -1, -1):
+            self.sink(k)
+        return self
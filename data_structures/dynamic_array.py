@@ -0,0 +1,95 @@
+""" Growable array of references, built on ArrayR. """
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+from typing import Generic
+from data_structures.referential_array import ArrayR, T
+
+
+class DynamicArrayR(Generic[T]):
+    """
+    Array of references that grows as elements are appended.
+
+    The elements live at the front of an ArrayR, and `append` on a full array moves them
+    into one GROWTH_FACTOR times larger, so appending is amortized O(1). `resize` sets
+    the capacity explicitly, e.g. to reserve room before a bulk load, or to give back
+    memory after removing many elements.
+
+    Indices run from 0 to len - 1; unlike ArrayR, the spare slots past the last element
+    cannot be read or written.
+    """
+    MIN_CAPACITY = 1
+    GROWTH_FACTOR = 2
+
+    def __init__(self, capacity: int = MIN_CAPACITY) -> None:
+        """
+        Creates an empty array with room for capacity elements.
+        :complexity: O(capacity)
+        """
+        self.length = 0
+        self.array = ArrayR(max(self.MIN_CAPACITY, capacity))
+        self.resize_count = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the array
+        :complexity: O(1)
+        """
+        return self.length
+
+    @property
+    def capacity(self) -> int:
+        """ Number of elements the array can hold before it has to grow. """
+        return len(self.array)
+
+    def _check_index(self, index: int) -> None:
+        if not 0 <= index < self.length:
+            raise IndexError("Index out of range: {0}".format(index))
+
+    def __getitem__(self, index: int) -> T:
+        """ Returns the object in position index.
+        :complexity: O(1)
+        :raises IndexError: if index is not between 0 and len - 1.
+        """
+        self._check_index(index)
+        return self.array[index]
+
+    def __setitem__(self, index: int, value: T) -> None:
+        """ Sets the object in position index to value
+        :complexity: O(1)
+        :raises IndexError: if index is not between 0 and len - 1.
+        """
+        self._check_index(index)
+        self.array[index] = value
+
+    def append(self, value: T) -> None:
+        """ Adds value after the last element, growing the array if it is full.
+        :complexity: amortized O(1), worst O(N) when the array has to grow.
+        """
+        if self.length == len(self.array):
+            self.resize(len(self.array) * self.GROWTH_FACTOR)
+        self.array[self.length] = value
+        self.length += 1
+
+    def pop(self) -> T:
+        """ Removes and returns the last element. The capacity is kept.
+        :complexity: O(1)
+        :raises IndexError: if the array is empty.
+        """
+        if self.length == 0:
+            raise IndexError("Pop from an empty array.")
+        self.length -= 1
+        value = self.array[self.length]
+        self.array[self.length] = None
+        return value
+
+    def resize(self, capacity: int) -> None:
+        """ Moves the elements into a new ArrayR with room for capacity elements.
+        :complexity: O(capacity)
+        :raises ValueError: if capacity is smaller than the number of elements or than MIN_CAPACITY.
+        """
+        if capacity < max(self.length, self.MIN_CAPACITY):
+            raise ValueError("Capacity {0} cannot hold {1} elements.".format(capacity, self.length))
+        new_array = ArrayR(capacity)
+        new_array.copy_from(self.array, 0, 0, self.length)
+        self.array = new_array
+        self.resize_count += 1
@@ -7,7 +7,10 @@ __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
-from typing import TypeVar, Generic
+from dataclasses import dataclass, field
+import time
+from typing import Callable, Iterable, Iterator, TypeVar, Generic
+from algorithms.primes import next_prime
 from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
@@ -17,46 +20,229 @@ class FullError(Exception):
     pass
 
 
+# Marks slots of the old array whose entry has been moved during an incremental rehash.
+# Unlike None it does not end a probe sequence.
+MOVED = object()
+
+
+HASH_BASE = 31
+HASH_MODULUS = (1 << 61) - 1
+
+
+def string_hash(key: str) -> int:
+    """
+    Polynomial string hash, independent of the table size.
+
+    :complexity: O(len(key))
+    """
+    value = 0
+    for char in key:
+        value = (value * HASH_BASE + ord(char)) % HASH_MODULUS
+    return value
+
+
+@dataclass
+class ProbeStats:
+    """
+    Statistics collected by a LinearProbeTable while `enable_stats` is in effect.
+
+    A probe's length is the number of slots it examined. Lookups of keys that are
+    present are successful probes; lookups of missing keys, and inserts of new keys,
+    are unsuccessful. probe_histogram[n] counts probes of length n.
+    rehash_time covers both stop-the-world resizes and incremental migration steps.
+    """
+
+    probe_histogram: list[int] = field(default_factory=list)
+    successful: int = 0
+    successful_total: int = 0
+    successful_max: int = 0
+    unsuccessful: int = 0
+    unsuccessful_total: int = 0
+    unsuccessful_max: int = 0
+    rehash_count: int = 0
+    rehash_time: float = 0.0
+    # Set while a resize or migration is being timed, so nested calls are not counted twice.
+    timing: bool = field(default=False, repr=False)
+
+    def record_probe(self, length: int, found: bool) -> None:
+        """ Count one probe of the given length. """
+        while len(self.probe_histogram) <= length:
+            self.probe_histogram.append(0)
+        self.probe_histogram[length] += 1
+        if found:
+            self.successful += 1
+            self.successful_total += length
+            self.successful_max = max(self.successful_max, length)
+        else:
+            self.unsuccessful += 1
+            self.unsuccessful_total += length
+            self.unsuccessful_max = max(self.unsuccessful_max, length)
+
+    @property
+    def mean_successful(self) -> float:
+        return self.successful_total / self.successful if self.successful else 0.0
+
+    @property
+    def mean_unsuccessful(self) -> float:
+        return self.unsuccessful_total / self.unsuccessful if self.unsuccessful else 0.0
+
+
 class LinearProbeTable(Generic[K, V]):
     """
     Linear Probe Table.
 
     Type Arguments:
         - K:    Key Type. In most cases should be string.
-                Otherwise `hash` should be overwritten.
+                Otherwise a `hash_function` should be given (or `hash` overridden).
         - V:    Value Type.
 
+    The hash function is pluggable: it maps a key to an integer of any size, and
+    the table reduces it modulo the table size. It defaults to `string_hash`;
+    passing the builtin `hash` is much faster and works for any hashable key.
+
+    Subclasses may still override `hash` instead, as before hash_function existed.
+    Such a `hash` returns a position for the current table size rather than a full
+    hash, so the table probes with it, and rehashes every key when it is resized
+    (stored hashes cannot be reused). Incremental rehashing is not available then.
+
+    Each slot stores (key, value, full hash), so the hash of a key is computed once
+    per operation: rehashing reuses the stored hashes, and probing only compares
+    keys whose full hashes already match. (Parallel key, value and hash arrays would
+    avoid building a tuple per update, but every reference stored in an ArrayR costs
+    a keep-alive entry, so they use more memory and make inserts slower overall;
+    see benchmarks/bench_table_layout.py.)
+
+    Once TABLE_SIZES runs out, the table keeps growing to the next prime at least
+    twice the current size. When deletions leave fewer than MIN_LOAD_FACTOR of the
+    slots in use, the table shrinks to a size at which it is about a quarter full,
+    so memory and full scans (keys, values) follow the number of entries. The gap
+    between the two thresholds keeps alternating inserts and deletes from resizing
+    back and forth. Tables that will hold a known number of entries can be sized
+    once with `reserve` or built with `from_items`; the reserved size is then kept
+    as a floor, so emptying the table does not undo it.
+
+    `iter_keys`, `iter_values` and `items` iterate lazily. With `ordered=True` the table
+    also keeps `dense_slots`, the positions of the occupied slots in insertion order
+    (deleted entries leave None holes until the list is compacted), plus `order_array`,
+    each slot's index into it. Iteration then costs O(len(self)) instead of O(table_size)
+    and yields entries in insertion order.
+
+    `enable_stats` starts collecting a ProbeStats (probe lengths, rehash count and time)
+    in `stats`, and `cluster_sizes` reports the current clustering. Collection works by
+    shadowing `_linear_probe`, `_resize` and `_migrate` with instrumented versions on
+    the instance, so a table without stats runs exactly the uninstrumented code.
+
+    With `incremental_rehash=True` a resize does not move every entry at once: the
+    old array is kept alongside the new one, and every access moves the entries in the
+    next REHASH_STEP slots of the old array (plus the key being accessed, if it is still
+    there) into the new array. Every key lives in exactly one of the two arrays, so the
+    usual operations only need to look at the new array after that.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
-    # No test case should exceed 1 million entries.
+    # Sizes used for the first resizes. Beyond these, primes are generated on demand.
     TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
 
-    HASH_BASE = 31
+    HASH_BASE = HASH_BASE
+
+    # The table grows once more than this fraction of its slots is in use.
+    MAX_LOAD_FACTOR = 0.5
 
-    def __init__(self, sizes=None) -> None:
+    # The table shrinks once fewer than this fraction of its slots are in use. 0 never shrinks.
+    MIN_LOAD_FACTOR = 0.125
+
+    # Number of old slots moved per access during an incremental rehash.
+    REHASH_STEP = 8
+
+    def __init__(self, sizes=None, hash_function: Callable[[K], int] | None = None,
+                 max_load_factor: float | None = None, incremental_rehash: bool = False,
+                 min_load_factor: float | None = None, ordered: bool = False) -> None:
         """
         Initialise the Hash Table.
+        :raises ValueError: if incremental_rehash is requested and `hash` is overridden.
         """
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        if max_load_factor is not None:
+            self.MAX_LOAD_FACTOR = max_load_factor
+        if min_load_factor is not None:
+            self.MIN_LOAD_FACTOR = min_load_factor
+        self.hash_function = string_hash if hash_function is None else hash_function
+        # An overridden hash depends on the table size, so it cannot be cached across resizes.
+        self.size_dependent_hash = type(self).hash is not LinearProbeTable.hash
+        self._full_hash = self.hash if self.size_dependent_hash else self.hash_function
+        if incremental_rehash and self.size_dependent_hash:
+            raise ValueError("Incremental rehashing needs a hash_function, not an overridden hash.")
+        self.ordered = ordered
+        self.dense_slots:list[int | None] = []
+        self.dense_holes = 0
         self.size_index = 0
-        self.array:ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
+        self._allocate(self.TABLE_SIZES[self.size_index])
         self.count = 0
+        self.reserved = 0
+        self.incremental_rehash = incremental_rehash
+        self.old_array:ArrayR[tuple[K, V, int]] | None = None
+        self.old_order_array:ArrayR[int] | None = None
+        self.migrate_position = 0
+        self.stats:ProbeStats | None = None
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]], expected: int | None = None, **kwargs) -> LinearProbeTable[K, V]:
+        """
+        Build a table from (key, value) pairs, sized once for `expected` entries
+        (len(items) if not given and items has a length), so loading it causes no rehash.
+        Other keyword arguments are passed on to the constructor.
+
+        :complexity: O(expected + N*hash(K)) where N is the number of items, assuming little probing.
+        """
+        table = cls(**kwargs)
+        if expected is None and hasattr(items, "__len__"):
+            expected = len(items)
+        if expected:
+            table.reserve(expected)
+        for key, value in items:
+            table[key] = value
+        return table
+
+    def reserve(self, n: int) -> None:
+        """
+        Grow the table, at most once, so that it can hold n entries without rehashing.
+        Deletions never shrink the table below this size.
+
+        :complexity: O(M + len(self)) where M is the new table size, or O(1) if it is already big enough.
+        """
+        self.reserved = max(self.reserved, n)
+        if n <= self.table_size * self.MAX_LOAD_FACTOR:
+            return
+        self._resize(*self._size_for(n))
+
+    def _size_for(self, n: int) -> tuple[int, int]:
+        """
+        Returns (size_index, table size) of the smallest table that holds n entries within
+        MAX_LOAD_FACTOR: from TABLE_SIZES if possible, otherwise a generated prime
+        (recorded with size_index past the end of TABLE_SIZES).
+        """
+        for size_index, size in enumerate(self.TABLE_SIZES):
+            if n <= size * self.MAX_LOAD_FACTOR:
+                return size_index, size
+        return len(self.TABLE_SIZES), next_prime(int(n / self.MAX_LOAD_FACTOR) + 1)
+
+    def _allocate(self, size: int) -> None:
+        """
+        Replace the slot array (and order_array, if ordered) with empty ones of the given size.
+        :complexity: O(size)
+        """
+        self.array:ArrayR[tuple[K, V, int]] = ArrayR(size)
+        self.order_array:ArrayR[int] | None = ArrayR(size) if self.ordered else None
 
     def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
 
-        :complexity: O(len(key))
+        :complexity: O(hash_function(key)), O(len(key)) for string_hash
         """
-
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        return self.hash_function(key) % self.table_size
 
     @property
     def table_size(self) -> int:
@@ -68,59 +254,102 @@ class LinearProbeTable(Generic[K, V]):
         """
         return self.count
 
-    def _linear_probe(self, key: K, is_insert: bool) -> int:
+    def _linear_probe(self, key: K, is_insert: bool, key_hash: int | None = None) -> int:
         """
         Find the correct position for this key in the hash table using linear probing.
+        key_hash is the full hash of key, computed here if not given.
         :complexity best: O(hash(key)) first position is empty
         :complexity worst: O(hash(key) + N*comp(K)) when we've searched the entire table
                         where N is the tablesize
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
+        if key_hash is None:
+            key_hash = self._full_hash(key)
+        array = self.array
+        size = self.table_size
         # Initial position
-        position = self.hash(key)
+        position = key_hash % size
 
-        for _ in range(self.table_size):
-            if self.array[position] is None:
+        for _ in range(size):
+            entry = array[position]
+            if entry is None:
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
                     return position
                 else:
                     raise KeyError(key)
-            elif self.array[position][0] == key:
+            elif entry[2] == key_hash and (entry[0] is key or entry[0] == key):
                 return position
             else:
                 # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
+                position = (position + 1) % size
 
         if is_insert:
             raise FullError("Table is full!")
         else:
             raise KeyError(key)
 
+    def _entries(self) -> Iterator[tuple[K, V, int]]:
+        """
+        Yields the (key, value, hash) entry of every occupied slot, in insertion order
+        if the table is ordered. Any incremental rehash in progress is completed first.
+        The table should not be modified while iterating.
+
+        :complexity: O(N) where N is len(self) if ordered, self.table_size otherwise.
+        """
+        self._finish_rehash()
+        if self.order_array is not None:
+            for position in self.dense_slots:
+                if position is not None:
+                    yield self.array[position]
+        else:
+            for entry in self.array:
+                if entry is not None:
+                    yield entry
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Lazily yields all keys in the hash table.
+
+        :complexity: See _entries.
+        """
+        for entry in self._entries():
+            yield entry[0]
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Lazily yields all values in the hash table.
+
+        :complexity: See _entries.
+        """
+        for entry in self._entries():
+            yield entry[1]
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields all (key, value) pairs in the hash table.
+
+        :complexity: See _entries.
+        """
+        for key, value, _ in self._entries():
+            yield key, value
+
     def keys(self) -> list[K]:
         """
         Returns all keys in the hash table.
 
-        :complexity: O(N) where N is self.table_size.
+        :complexity: O(N) where N is self.table_size, or len(self) if ordered.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][0])
-        return res
+        return list(self.iter_keys())
 
     def values(self) -> list[V]:
         """
         Returns all values in the hash table.
 
-        :complexity: O(N) where N is self.table_size.
+        :complexity: O(N) where N is self.table_size, or len(self) if ordered.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][1])
-        return res
+        return list(self.iter_values())
 
     def __contains__(self, key: K) -> bool:
         """
@@ -142,7 +371,10 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: See linear probe.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
+        key_hash = self._full_hash(key)
+        if self.old_array is not None:
+            self._rehash_step(key, key_hash)
+        position = self._linear_probe(key, False, key_hash)
         return self.array[position][1]
 
     def __setitem__(self, key: K, data: V) -> None:
@@ -153,14 +385,22 @@ class LinearProbeTable(Generic[K, V]):
         :raises FullError: when the table cannot be resized further.
         """
 
-        position = self._linear_probe(key, True)
+        key_hash = self._full_hash(key)
+        if self.old_array is not None:
+            self._rehash_step(key, key_hash)
+        position = self._linear_probe(key, True, key_hash)
 
-        if self.array[position] is None:
-            self.count += 1
+        if self.array[position] is not None:
+            # Existing key: replace its entry.
+            self.array[position] = (key, data, key_hash)
+            return
 
-        self.array[position] = (key, data)
+        self.array[position] = (key, data, key_hash)
+        self.count += 1
+        if self.order_array is not None:
+            self._append_order(position)
 
-        if len(self) > self.table_size / 2:
+        if len(self) > self.table_size * self.MAX_LOAD_FACTOR:
             self._rehash()
 
     def __delitem__(self, key: K) -> None:
@@ -168,22 +408,89 @@ class LinearProbeTable(Generic[K, V]):
         Deletes a (key, value) pair in our hash table.
 
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
-        :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+        :complexity worst: O(hash(key) + N*comp(K) + N^2) deleting item is midway through large chain.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
+        key_hash = self._full_hash(key)
+        if self.old_array is not None:
+            self._rehash_step(key, key_hash)
+        position = self._linear_probe(key, False, key_hash)
         # Remove the element
-        self.array[position] = None
+        if self.order_array is not None:
+            self._drop_order(position)
+        self._clear_slot(position)
         self.count -= 1
         # Start moving over the cluster
         position = (position + 1) % self.table_size
         while self.array[position] is not None:
-            key2, value = self.array[position]
-            self.array[position] = None
-            # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
+            item = self.array[position]
+            order = self.order_array[position] if self.order_array is not None else None
+            self._clear_slot(position)
+            # Reinsert, using the stored hash.
+            self._place(item, order)
             position = (position + 1) % self.table_size
+        self._maybe_shrink()
+
+    def _clear_slot(self, position: int) -> None:
+        """ Empty the slot at position. """
+        self.array[position] = None
+        if self.order_array is not None:
+            self.order_array[position] = None
+
+    def _place(self, item: tuple[K, V, int], order: int | None = None) -> None:
+        """
+        Store an entry whose key is known not to be in the table, using its stored hash.
+        order is the entry's index in dense_slots, if the table is ordered.
+        :complexity: See _empty_position.
+        """
+        position = self._empty_position(item[2])
+        self.array[position] = item
+        if order is not None:
+            self._set_order(position, order)
+
+    def _set_order(self, position: int, order: int) -> None:
+        """ Record that the entry with index order in dense_slots now lives at position. """
+        self.order_array[position] = order
+        self.dense_slots[order] = position
+
+    def _append_order(self, position: int) -> None:
+        """
+        Add the (new) entry at position to the end of dense_slots, compacting it
+        first if more than half of it is holes and no incremental rehash is in progress.
+        :complexity: O(1) amortized, O(N) when compacting where N is len(self).
+        """
+        if self.dense_holes * 2 > len(self.dense_slots) and self.old_array is None:
+            dense = []
+            for dense_position in self.dense_slots:
+                if dense_position is not None:
+                    self.order_array[dense_position] = len(dense)
+                    dense.append(dense_position)
+            self.dense_slots = dense
+            self.dense_holes = 0
+        self.order_array[position] = len(self.dense_slots)
+        self.dense_slots.append(position)
+
+    def _drop_order(self, position: int) -> None:
+        """ Leave a hole in dense_slots for the entry at position, which is being deleted. """
+        self.dense_slots[self.order_array[position]] = None
+        self.dense_holes += 1
+
+    def _empty_position(self, key_hash: int) -> int:
+        """
+        Find the first empty slot probing from key_hash, for an entry known not to be in the table.
+        No keys are compared.
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N) where N is the tablesize
+        :raises FullError: When the table is full.
+        """
+        array = self.array
+        size = self.table_size
+        position = key_hash % size
+        for _ in range(size):
+            if array[position] is None:
+                return position
+            position = (position + 1) % size
+        raise FullError("Table is full!")
 
     def is_empty(self) -> bool:
         return self.count == 0
@@ -191,25 +498,221 @@ class LinearProbeTable(Generic[K, V]):
     def is_full(self) -> bool:
         return self.count == self.table_size
 
+    def _next_table_size(self) -> int:
+        """
+        The size to use for self.size_index: from TABLE_SIZES while it lasts,
+        then the next prime at least twice the current size.
+        """
+        if self.size_index < len(self.TABLE_SIZES):
+            return self.TABLE_SIZES[self.size_index]
+        return next_prime(2 * self.table_size)
+
     def _rehash(self) -> None:
         """
         Need to resize table and reinsert all values
 
-        :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
-        Where N is len(self)
+        :complexity: See _resize.
         """
-        old_array = self.array
+        self._finish_rehash()
         self.size_index += 1
-        if self.size_index >= len(self.TABLE_SIZES):
-            # Cannot be resized further.
+        self._resize(self.size_index, self._next_table_size())
+
+    def _maybe_shrink(self) -> None:
+        """
+        Shrink the table if fewer than MIN_LOAD_FACTOR of its slots are in use,
+        to the smallest size that holds twice the current entries, but never below
+        the size reserved with `reserve`.
+
+        :complexity: O(1), or see _resize if the table shrinks.
+        """
+        if self.count >= self.table_size * self.MIN_LOAD_FACTOR:
             return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
-        self.count = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+        size_index, size = self._size_for(max(1, 2 * self.count, self.reserved))
+        if size < self.table_size:
+            self._resize(size_index, size)
+
+    def _resize(self, size_index: int, size: int) -> None:
+        """
+        Move every entry into a new array of the given size.
+
+        Stored hashes are reused, so no key is hashed or compared, unless `hash` is
+        overridden: then every key is hashed again for the new size.
+        In incremental mode this only allocates the new array and leaves the
+        entries to be moved by later accesses (see _rehash_step).
+
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2) Lots of probing.
+        Where N is len(self)
+        """
+        self._finish_rehash()
+        old_array, old_orders = self.array, self.order_array
+        self.size_index = size_index
+        self._allocate(size)
+        if self.incremental_rehash:
+            self.old_array, self.old_order_array = old_array, old_orders
+            self.migrate_position = 0
+            return
+        if self.size_dependent_hash:
+            old_array = [None if item is None else (item[0], item[1], self.hash(item[0])) for item in old_array]
+        # The old slots are read by C-level iteration, not one __getitem__ call per slot.
+        place = self._place
+        if old_orders is None:
+            for item in old_array:
+                if item is not None:
+                    place(item)
+        else:
+            for item, order in zip(old_array, old_orders):
+                if item is not None:
+                    place(item, order)
+
+    def _rehash_step(self, key: K, key_hash: int) -> None:
+        """
+        Advance an incremental rehash before accessing key: move the entries in the
+        next REHASH_STEP slots of the old array, and key itself if it is still there.
+        :pre: an incremental rehash is in progress.
+        :complexity: O(REHASH_STEP + C) where C is the length of key's cluster in the old array.
+        """
+        old_array = self.old_array
+        old_size = len(old_array)
+
+        position = key_hash % old_size
+        for _ in range(old_size):
+            entry = old_array[position]
+            if entry is None:
+                break
+            if entry is not MOVED and entry[2] == key_hash and (entry[0] is key or entry[0] == key):
+                self._move_old_slot(position)
+                break
+            position = (position + 1) % old_size
+
+        self._migrate(self.REHASH_STEP)
+
+    def _move_old_slot(self, position: int) -> None:
+        """ Move the entry at position of the old array into the new one, leaving MOVED behind. """
+        old_orders = self.old_order_array
+        self._place(self.old_array[position], old_orders[position] if old_orders is not None else None)
+        self.old_array[position] = MOVED
+
+    def _migrate(self, n_slots: int) -> None:
+        """
+        Move the entries in the next n_slots slots of the old array into the new one,
+        dropping the old array once it has been fully scanned.
+        :complexity: O(n_slots) if no probing is needed in the new array.
+        """
+        old_array = self.old_array
+        end = min(len(old_array), self.migrate_position + n_slots)
+        for position in range(self.migrate_position, end):
+            entry = old_array[position]
+            if entry is not None and entry is not MOVED:
+                self._move_old_slot(position)
+        self.migrate_position = end
+        if end == len(old_array):
+            self.old_array = self.old_order_array = None
+
+    def _finish_rehash(self) -> None:
+        """
+        Complete any incremental rehash in progress.
+        :complexity: O(M) where M is the size of the old array.
+        """
+        if self.old_array is not None:
+            self._migrate(len(self.old_array))
+
+    def enable_stats(self) -> ProbeStats:
+        """
+        Start collecting statistics into a fresh self.stats, which is returned.
+        """
+        self.stats = ProbeStats()
+        self._linear_probe = self._instrumented_linear_probe
+        self._resize = self._instrumented_resize
+        self._migrate = self._instrumented_migrate
+        return self.stats
+
+    def disable_stats(self) -> ProbeStats | None:
+        """
+        Stop collecting statistics, returning what was collected.
+        """
+        stats, self.stats = self.stats, None
+        for name in ("_linear_probe", "_resize", "_migrate"):
+            self.__dict__.pop(name, None)
+        return stats
+
+    def _instrumented_linear_probe(self, key: K, is_insert: bool, key_hash: int | None = None) -> int:
+        """
+        _linear_probe, recording the probe length in self.stats.
+        For a missing key the probe is repeated as an insert to find where it ended.
+        """
+        if key_hash is None:
+            key_hash = self._full_hash(key)
+        probe = type(self)._linear_probe
+        home = key_hash % self.table_size
+        try:
+            position = probe(self, key, is_insert, key_hash)
+        except KeyError:
+            try:
+                end = probe(self, key, True, key_hash)
+                self.stats.record_probe((end - home) % self.table_size + 1, False)
+            except FullError:
+                self.stats.record_probe(self.table_size, False)
+            raise
+        except FullError:
+            self.stats.record_probe(self.table_size, False)
+            raise
+        entry = self.array[position]
+        found = entry is not None and entry[2] == key_hash and (entry[0] is key or entry[0] == key)
+        self.stats.record_probe((position - home) % self.table_size + 1, found)
+        return position
+
+    def _instrumented_resize(self, size_index: int, size: int) -> None:
+        """ _resize, counting it and timing it in self.stats. """
+        self.stats.rehash_count += 1
+        self._timed(type(self)._resize, size_index, size)
+
+    def _instrumented_migrate(self, n_slots: int) -> None:
+        """ _migrate, timing it in self.stats. """
+        self._timed(type(self)._migrate, n_slots)
+
+    def _timed(self, method, *args) -> None:
+        """ Call method, adding its run time to self.stats unless an enclosing call is already timed. """
+        stats = self.stats
+        if stats.timing:
+            method(self, *args)
+            return
+        stats.timing = True
+        start = time.perf_counter()
+        try:
+            method(self, *args)
+        finally:
+            stats.rehash_time += time.perf_counter() - start
+            stats.timing = False
+
+    def cluster_sizes(self) -> list[int]:
+        """
+        Returns the cluster-size distribution: element n counts the maximal runs of n
+        consecutive occupied slots (wrapping around the end of the table).
+        Any incremental rehash in progress is completed first.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        self._finish_rehash()
+        array = self.array
+        size = self.table_size
+        histogram = [0]
+        start = 0
+        while start < size and array[start] is not None:
+            start += 1
+        if start == size:
+            return histogram + [0] * (size - 1) + [1]
+        run = 0
+        for offset in range(1, size + 1):
+            if array[(start + offset) % size] is None:
+                if run:
+                    while len(histogram) <= run:
+                        histogram.append(0)
+                    histogram[run] += 1
+                run = 0
+            else:
+                run += 1
+        return histogram
 
     def __str__(self) -> str:
         """
@@ -218,8 +721,6 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: O(N * (str(key) + str(value))) where N is the table size
         """
         result = ""
-        for item in self.array:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for key, value in self.items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
         return result
@@ -3,53 +3,131 @@ from __future__ import annotations
 __author__ = "Brendon Taylor, modified by Jackson Goerner"
 __docformat__ = 'reStructuredText'
 
-from typing import Generic
+import operator
+from typing import Any, Callable, Generic, Iterable
+from algorithms.mergesort import mergesort
 from data_structures.referential_array import ArrayR, T
 
 
 class MaxHeap(Generic[T]):
+    """
+    Max Heap.
+
+    By default the heap grows by doubling its capacity whenever `add` is called on a full heap,
+    so `add` is amortized O(log N) and `max_size` is only a starting capacity.
+    Pass `growable=False` to keep a fixed capacity (add then raises IndexError when full), and
+    `shrinkable=True` to halve the capacity whenever the heap drops to a quarter full
+    (never below the starting capacity).
+
+    `capacity`, `grow_count` and `shrink_count` can be inspected to tune the starting size.
+
+    If `key` is given, elements are ordered by key(element) instead of by the elements themselves.
+    Keys are computed once on insertion and cached in `the_keys`, an array parallel to `the_array`,
+    so (priority, payload) tuples are not needed. Without a key `the_keys` is `the_array` itself.
+    """
     MIN_CAPACITY = 1
+    GROWTH_FACTOR = 2
+    SHRINK_THRESHOLD = 4
+
+    # _before(a, b) is True when a key of a must sit above a key of b.
+    _before = staticmethod(operator.gt)
 
-    def __init__(self, max_size: int) -> None:
+    def __init__(self, max_size: int, growable: bool = True, shrinkable: bool = False,
+                 key: Callable[[T], Any] | None = None) -> None:
         self.length = 0
+        self.key = key
         self.the_array = ArrayR(max(self.MIN_CAPACITY, max_size) + 1)
+        self.the_keys = ArrayR(len(self.the_array)) if key is not None else self.the_array
+        self.initial_capacity = self.capacity
+        self.growable = growable
+        self.shrinkable = shrinkable
+        self.grow_count = 0
+        self.shrink_count = 0
 
     def __len__(self) -> int:
         return self.length
 
+    @property
+    def capacity(self) -> int:
+        """ Number of elements the heap can hold before it has to resize. """
+        return len(self.the_array) - 1
+
+    @property
+    def resize_count(self) -> int:
+        """ Total number of times the underlying array has been reallocated. """
+        return self.grow_count + self.shrink_count
+
     def is_full(self) -> bool:
         return self.length + 1 == len(self.the_array)
 
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Move the heap into a new array with room for new_capacity elements.
+        :pre: new_capacity >= self.length
+        :complexity: O(N) where N is len(self)
+        """
+        new_array = ArrayR(new_capacity + 1)
+        new_array.copy_from(self.the_array, 1, 1, self.length)
+        if self.key is not None:
+            new_keys = ArrayR(new_capacity + 1)
+            new_keys.copy_from(self.the_keys, 1, 1, self.length)
+            self.the_keys = new_keys
+        else:
+            self.the_keys = new_array
+        self.the_array = new_array
+
+    def _place(self, k: int, element: T) -> None:
+        """ Store element at index k, caching its key if the heap is keyed. """
+        self.the_array[k] = element
+        if self.key is not None:
+            self.the_keys[k] = self.key(element)
+
+    def _key_of(self, element: T):
+        """ The priority an element is compared by. """
+        return element if self.key is None else self.key(element)
+
     def rise(self, k: int) -> None:
         """
         Rise element at index k to its correct position
         :pre: 1 <= k <= self.length
         """
-        item = self.the_array[k]
-        while k > 1 and item > self.the_array[k // 2]:
-            self.the_array[k] = self.the_array[k // 2]
+        items, keys, before = self.the_array, self.the_keys, self._before
+        keyed = keys is not items
+        item, item_key = items[k], keys[k]
+        while k > 1 and before(item_key, keys[k // 2]):
+            items[k] = items[k // 2]
+            if keyed:
+                keys[k] = keys[k // 2]
             k = k // 2
-        self.the_array[k] = item
+        items[k] = item
+        if keyed:
+            keys[k] = item_key
 
     def add(self, element: T) -> bool:
         """
         Swaps elements while rising
+        :complexity: amortized O(log N), worst O(N) when the heap has to grow.
+        :raises IndexError: if the heap is full and not growable.
         """
         if self.is_full():
-            raise IndexError
+            if not self.growable:
+                raise IndexError
+            self._resize(self.capacity * self.GROWTH_FACTOR)
+            self.grow_count += 1
 
         self.length += 1
-        self.the_array[self.length] = element
+        self._place(self.length, element)
         self.rise(self.length)
 
     def largest_child(self, k: int) -> int:
         """
-        Returns the index of k's child with greatest value.
+        Returns the index of k's child with greatest value
+        (for a MinHeap, the child with the smallest value).
         :pre: 1 <= k <= self.length // 2
         """
-
+        keys = self.the_keys
         if 2 * k == self.length or \
-                self.the_array[2 * k] > self.the_array[2 * k + 1]:
+                self._before(keys[2 * k], keys[2 * k + 1]):
             return 2 * k
         else:
             return 2 * k + 1
@@ -57,18 +135,33 @@ class MaxHeap(Generic[T]):
     def sink(self, k: int) -> None:
         """ Make the element at index k sink to the correct position.
             :pre: 1 <= k <= self.length
-            :complexity: ???
+            :complexity: O(log N) where N is len(self)
         """
-        item = self.the_array[k]
+        items, keys, before = self.the_array, self.the_keys, self._before
+        keyed = keys is not items
+        item, item_key = items[k], keys[k]
 
         while 2 * k <= self.length:
             max_child = self.largest_child(k)
-            if self.the_array[max_child] <= item:
+            if not before(keys[max_child], item_key):
                 break
-            self.the_array[k] = self.the_array[max_child]
+            items[k] = items[max_child]
+            if keyed:
+                keys[k] = keys[max_child]
             k = max_child
 
-        self.the_array[k] = item
+        items[k] = item
+        if keyed:
+            keys[k] = item_key
+
+    def peek(self) -> T:
+        """
+        Return the top element without removing it.
+        :raises IndexError: if the heap is empty.
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[1]
 
     def get_max(self) -> T:
         """ Remove (and return) the maximum element from the heap. """
@@ -79,20 +172,165 @@ class MaxHeap(Generic[T]):
         self.length -= 1
         if self.length > 0:
             self.the_array[1] = self.the_array[self.length+1]
+            self.the_keys[1] = self.the_keys[self.length+1]
             self.sink(1)
+        self.the_array[self.length+1] = None
+        self.the_keys[self.length+1] = None
+        self._maybe_shrink()
         return max_elt
 
+    def pushpop(self, element: T) -> T:
+        """
+        Add element, then remove and return the top element, using at most one sink.
+        If element would itself be the top, it is returned straight away and the heap is untouched.
+        :complexity: O(log N) where N is len(self)
+        """
+        if self.length == 0 or not self._before(self.the_keys[1], self._key_of(element)):
+            return element
+        top = self.the_array[1]
+        self._place(1, element)
+        self.sink(1)
+        return top
+
+    def replace_top(self, element: T) -> T:
+        """
+        Remove and return the top element, then add element, using a single sink.
+        Unlike pushpop, the returned element is always the old top, even if element beats it.
+        :complexity: O(log N) where N is len(self)
+        :raises IndexError: if the heap is empty.
+        """
+        if self.length == 0:
+            raise IndexError
+        top = self.the_array[1]
+        self._place(1, element)
+        self.sink(1)
+        return top
+
+    def _maybe_shrink(self) -> None:
+        """
+        Halve the capacity if the heap is shrinkable and at most a quarter full.
+        Waiting for a quarter (rather than half) gives hysteresis, so alternating
+        add/get_max at a boundary cannot cause repeated resizes.
+        """
+        if not self.shrinkable:
+            return
+        new_capacity = self.capacity // self.GROWTH_FACTOR
+        if new_capacity >= self.initial_capacity and self.length * self.SHRINK_THRESHOLD <= self.capacity:
+            self._resize(new_capacity)
+            self.shrink_count += 1
+
     @classmethod
-    def heapify(cls, points: ArrayR[T], overwrite_size: int = 0) -> MaxHeap[T]:
-        self = MaxHeap(overwrite_size or (2 * len(points) + 2))
+    def heapify(cls, points: ArrayR[T], overwrite_size: int = 0, key: Callable[[T], Any] | None = None) -> MaxHeap[T]:
+        self = cls(overwrite_size or (2 * len(points) + 2), key=key)
         self.length = len(points)
-        for i in range(len(points)):
-            self.the_array[i+1] = points[i]
-        for k in range(len(points), 0, -1):
+        self.the_array.copy_from(points, 0, 1, len(points))
+        if key is not None:
+            self.the_keys[1:len(points) + 1] = [key(point) for point in points]
+        for k in range(len(points) // 2, 0, -1):
             self.sink(k)
         return self
 
 
+class MinHeap(MaxHeap[T]):
+    """
+    Min Heap. Identical to MaxHeap (including `key`, growth and `pushpop`/`replace_top`),
+    except that the smallest element is kept at the top.
+    """
+
+    _before = staticmethod(operator.lt)
+
+    def get_min(self) -> T:
+        """ Remove (and return) the minimum element from the heap. """
+        return self.get_max()
+
+
+class TopK(Generic[T]):
+    """
+    Streaming accumulator of the k largest elements seen so far.
+
+    Keeps a MinHeap bounded at k elements whose top is the smallest of the current best k,
+    so each new element costs a single comparison when it does not qualify and a single
+    pushpop when it does: O(N log k) time and O(k) memory over a stream of N elements.
+    Partial results from separate workers can be combined with `merge`.
+    """
+
+    def __init__(self, k: int, key: Callable[[T], Any] | None = None) -> None:
+        self.k = k
+        self.key = key
+        self.heap = MinHeap(k, growable=False, key=key)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def add(self, element: T) -> None:
+        """
+        Offer element to the accumulator.
+        :complexity: O(log k)
+        """
+        if self.k <= 0:
+            return
+        if len(self.heap) < self.k:
+            self.heap.add(element)
+        else:
+            self.heap.pushpop(element)
+
+    def extend(self, iterable: Iterable[T]) -> TopK[T]:
+        """
+        Offer every element of iterable, returning self.
+        :complexity: O(N log k) where N is the number of elements in iterable.
+        """
+        for element in iterable:
+            self.add(element)
+        return self
+
+    def merge(self, other: TopK[T] | Iterable[T]) -> TopK[T]:
+        """
+        Fold the elements kept by another accumulator into this one, returning self.
+        other may also be any iterable of kept elements, e.g. the results() that a
+        worker process sent back. Both sides should use the same key.
+        :complexity: O(k' log k) where k' is len(other).
+        """
+        if isinstance(other, TopK):
+            other = other._kept()
+        return self.extend(other)
+
+    def _kept(self) -> list[T]:
+        """ The kept elements, in heap order. """
+        return self.heap.the_array[1:len(self.heap) + 1]
+
+    def results(self) -> list[T]:
+        """
+        The kept elements, largest first.
+        :complexity: O(k log k)
+        """
+        items = self._kept()
+        if self.key is None:
+            return mergesort(items)[::-1]
+        return mergesort(items, key=self.key)[::-1]
+
+    def __reduce__(self):
+        """
+        The ArrayR inside the heap cannot be pickled, so an accumulator is pickled as
+        k, key and its kept elements, and rebuilt by adding them to a new one.
+        This lets workers in other processes send their TopK back to be merged.
+        The key, if any, must itself be picklable (a module-level function, not a lambda).
+        """
+        return _rebuild_top_k, (type(self), self.k, self.key, self._kept())
+
+
+def _rebuild_top_k(cls: type[TopK], k: int, key: Callable[[T], Any] | None, kept: list[T]) -> TopK[T]:
+    """ Rebuild a pickled TopK (see TopK.__reduce__). """
+    return cls(k, key=key).extend(kept)
+
+
+def nlargest(iterable: Iterable[T], k: int, key: Callable[[T], Any] | None = None) -> list[T]:
+    """
+    Return the k largest elements of iterable, largest first, without holding the whole stream.
+    :complexity: O(N log k) time, O(k) memory, where N is the number of elements in iterable.
+    """
+    return TopK(k, key=key).extend(iterable).results()
+
+
 if __name__ == '__main__':
     items = [ int(x) for x in input('Enter a list of numbers: ').strip().split() ]
     heap = MaxHeap(len(items))
@@ -0,0 +1,108 @@
+"""
+    Hash-based implementation of Set ADT.
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterator
+from data_structures.hash_table import LinearProbeTable
+from data_structures.set import Set, T
+
+
+class HSet(Set[T]):
+    """Set implemented on a LinearProbeTable, whose keys are the elements.
+
+    Attributes:
+        * table (LinearProbeTable[T, None]): table whose keys are the elements of the set
+
+    Membership, add and remove are expected O(1), so union and difference are
+    O(n + m) and intersection O(min(n, m)), where ASet needs O(n * m).
+    Elements must be hashable by hash_function, which defaults to the builtin hash.
+    """
+
+    def __init__(self, capacity: int = 0, hash_function: Callable[[T], int] = hash) -> None:
+        """ Initialization, with room for capacity elements before the table has to grow. """
+        self.capacity = capacity
+        self.hash_function = hash_function
+        Set.__init__(self)
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the set. """
+        return len(self.table)
+
+    def is_empty(self) -> bool:
+        """ True if the set is empty. """
+        return len(self) == 0
+
+    def clear(self) -> None:
+        """ Makes the set empty. """
+        self.table = LinearProbeTable(hash_function=self.hash_function)
+        self.table.reserve(self.capacity)
+
+    def __contains__(self, item: T) -> bool:
+        """ True if the set contains the item.
+        :complexity: See LinearProbeTable.__contains__.
+        """
+        return item in self.table
+
+    def __iter__(self) -> Iterator[T]:
+        """ Yields the elements of the set, in no particular order. """
+        return self.table.iter_keys()
+
+    def add(self, item: T) -> None:
+        """ Adds an element to the set. An element already present in the set is not added again.
+        :complexity: See LinearProbeTable.__setitem__.
+        """
+        self.table[item] = None
+
+    def remove(self, item: T) -> None:
+        """ Removes an element from the set.
+        :pre: the element should be present in the set
+        :raises KeyError: if no such element is found.
+        """
+        del self.table[item]
+
+    def _empty_like(self, capacity: int) -> HSet[T]:
+        return HSet(capacity, self.hash_function)
+
+    def union(self, other: HSet[T]) -> HSet[T]:
+        """ Creates a new set equal to the union with another one,
+        i.e. the result set should contains the elements of self and other.
+        :complexity: O(n + m) expected, where n and m are the sizes of the sets.
+        """
+        res = self._empty_like(len(self) + len(other))
+        for the_set in [self, other]:
+            for item in the_set:
+                res.add(item)
+        return res
+
+    def intersection(self, other: HSet[T]) -> HSet[T]:
+        """ Creates a new set equal to the intersection with another one,
+        i.e. the result set should contain the elements that are both in
+        self *and* other. Only the smaller set is iterated over.
+        :complexity: O(min(n, m)) expected, where n and m are the sizes of the sets.
+        """
+        smaller, larger = (self, other) if len(self) <= len(other) else (other, self)
+        res = self._empty_like(len(smaller))
+        for item in smaller:
+            if item in larger:
+                res.add(item)
+        return res
+
+    def difference(self, other: HSet[T]) -> HSet[T]:
+        """ Creates a new set equal to the difference with another one,
+        i.e. the result set should contain the elements of self that
+        *are not* in other.
+        :complexity: O(n) expected, where n is the size of self.
+        """
+        res = self._empty_like(len(self))
+        for item in self:
+            if item not in other:
+                res.add(item)
+        return res
+
+    def __str__(self):
+        """ Magic method constructing a string representation of the set object. """
+        elems = []
+        for item in self:
+            elems.append(str(item) if type(item) != str else "'{0}'".format(item))
+        return '{' + ', '.join(elems) + '}'
@@ -0,0 +1,367 @@
+""" Memory-mapped Hash Table
+
+Defines a persistent Hash Table using Linear Probing for conflict resolution,
+whose slots live in a memory-mapped file.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Callable, Iterator
+from algorithms.primes import next_prime
+from data_structures.hash_table import LinearProbeTable, FullError, string_hash
+
+
+class MmapTable:
+    """
+    Memory-mapped Linear Probe Table.
+
+    Keys are strings and values are bytes (callers encode richer values themselves).
+    Probing, resizing and deletion follow LinearProbeTable, but the table is stored in
+    a single file, mapped into memory:
+
+        header | table_size fixed-size slot records | heap
+
+    A slot record holds the key's full hash plus one (0 marks an empty slot), and the
+    offset and lengths of the key and value bytes, which are stored one after the other
+    in the heap. Opening a table only maps the file and reads the header, and a lookup
+    only touches the pages of the slots it probes and of the keys it compares.
+
+    The hash function must be stable across processes, so it defaults to `string_hash`
+    (the builtin `hash` is randomised per process for strings) and must return
+    values in [0, 2^63 - 1). Changes are written to the mapping straight away; `flush`
+    forces them to disk.
+
+    Updating a value in place reuses its heap bytes if the new value is no longer;
+    otherwise, and for deleted entries, the old bytes become garbage. The header counts
+    the garbage bytes, and once they make up more than half of the heap the table is
+    rewritten at the same size without them, so a table whose keys are mostly updated
+    or deleted and re-inserted does not grow without bound. Resizing drops them as well.
+    """
+
+    MAGIC = b"LPTMMAP1"
+    HEADER = struct.Struct("<8sQQQQQ")
+    HEADER_SIZE = 64
+    RECORD = struct.Struct("<QQII")
+
+    # Shared with LinearProbeTable, extended by doubling to the next prime.
+    TABLE_SIZES = LinearProbeTable.TABLE_SIZES
+    MAX_LOAD_FACTOR = LinearProbeTable.MAX_LOAD_FACTOR
+    MIN_HEAP_CAPACITY = 4096
+    HASH_LIMIT = (1 << 63) - 1
+
+    def __init__(self, path: str, hash_function: Callable[[str], int] = string_hash) -> None:
+        """
+        Open an existing table file. Use `create` to make a new one.
+
+        :complexity: O(1)
+        :raises ValueError: if the file is not a table file.
+        """
+        self.path = path
+        self.hash_function = hash_function
+        self.file = open(path, "r+b")
+        # An empty file cannot be mapped at all, so check the size before mapping.
+        if os.fstat(self.file.fileno()).st_size < self.HEADER_SIZE:
+            self.file.close()
+            raise ValueError(f"{path} is not a memory-mapped hash table.")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0)
+        except BaseException:
+            self.file.close()
+            raise
+        if self.map[:len(self.MAGIC)] != self.MAGIC:
+            self.map.close()
+            self.file.close()
+            raise ValueError(f"{path} is not a memory-mapped hash table.")
+        # Files written before heap_garbage was recorded have zero padding there.
+        (_, self.table_size, self.count, self.heap_used, self.heap_capacity,
+         self.heap_garbage) = self.HEADER.unpack_from(self.map, 0)
+
+    @classmethod
+    def create(cls, path: str, expected: int = 0, hash_function: Callable[[str], int] = string_hash) -> MmapTable:
+        """
+        Create (or overwrite) a table file sized for `expected` entries, and open it.
+
+        :complexity: O(M) where M is the table size.
+        """
+        cls._write_empty(path, cls._size_for(expected), cls.MIN_HEAP_CAPACITY)
+        return cls(path, hash_function)
+
+    @classmethod
+    def _size_for(cls, n: int) -> int:
+        """ Smallest table size that holds n entries within MAX_LOAD_FACTOR. """
+        for size in cls.TABLE_SIZES:
+            if n <= size * cls.MAX_LOAD_FACTOR:
+                return size
+        return next_prime(int(n / cls.MAX_LOAD_FACTOR) + 1)
+
+    @classmethod
+    def _write_empty(cls, path: str, table_size: int, heap_capacity: int) -> None:
+        """ Write an empty table file: zeroed slots mean every slot is empty. """
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, table_size, 0, 0, heap_capacity, 0).ljust(cls.HEADER_SIZE, b"\0"))
+            f.truncate(cls.HEADER_SIZE + table_size * cls.RECORD.size + heap_capacity)
+
+    def __enter__(self) -> MmapTable:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        """ Write the header and flush the mapping to disk. """
+        self._write_header()
+        self.map.flush()
+
+    def close(self) -> None:
+        """ Flush and unmap the table. """
+        if not self.map.closed:
+            self.flush()
+            self.map.close()
+        self.file.close()
+
+    def _write_header(self) -> None:
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.table_size, self.count, self.heap_used, self.heap_capacity,
+                              self.heap_garbage)
+
+    @property
+    def heap_start(self) -> int:
+        return self.HEADER_SIZE + self.table_size * self.RECORD.size
+
+    def _record_offset(self, position: int) -> int:
+        return self.HEADER_SIZE + position * self.RECORD.size
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+        """
+        return self.count
+
+    def _hash(self, key: str) -> int:
+        """
+        Full hash of key.
+        :raises ValueError: if hash_function returns a value outside [0, HASH_LIMIT).
+        """
+        key_hash = self.hash_function(key)
+        if not 0 <= key_hash < self.HASH_LIMIT:
+            raise ValueError(f"hash_function returned {key_hash} for {key!r}, outside [0, 2^63 - 1).")
+        return key_hash
+
+    def _key_at(self, key_offset: int, key_length: int) -> bytes:
+        start = self.heap_start + key_offset
+        return self.map[start:start + key_length]
+
+    def _linear_probe(self, key: bytes, key_hash: int, is_insert: bool) -> int:
+        """
+        Find the correct position for this key in the hash table using linear probing.
+        :complexity best: O(len(key)) first position is empty
+        :complexity worst: O(N*len(key)) when we've searched the entire table
+                        where N is the tablesize
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        stored_hash = key_hash + 1
+        position = key_hash % self.table_size
+        for _ in range(self.table_size):
+            slot_hash, key_offset, key_length, _ = self.RECORD.unpack_from(self.map, self._record_offset(position))
+            if slot_hash == 0:
+                if is_insert:
+                    return position
+                raise KeyError(key.decode("utf-8"))
+            elif slot_hash == stored_hash and key_length == len(key) and self._key_at(key_offset, key_length) == key:
+                return position
+            position = (position + 1) % self.table_size
+
+        if is_insert:
+            raise FullError("Table is full!")
+        raise KeyError(key.decode("utf-8"))
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See linear probe.
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: str) -> bytes:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        :raises ValueError: when hash_function returns a value out of range.
+        """
+        encoded = key.encode("utf-8")
+        position = self._linear_probe(encoded, self._hash(key), False)
+        _, key_offset, key_length, value_length = self.RECORD.unpack_from(self.map, self._record_offset(position))
+        start = self.heap_start + key_offset + key_length
+        return self.map[start:start + value_length]
+
+    def __setitem__(self, key: str, data: bytes) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See linear probe, plus O(len(key) + len(data)) to store them.
+        :raises ValueError: when hash_function returns a value out of range.
+        """
+        encoded = key.encode("utf-8")
+        key_hash = self._hash(key)
+        position = self._linear_probe(encoded, key_hash, True)
+        record_offset = self._record_offset(position)
+        slot_hash, key_offset, key_length, value_length = self.RECORD.unpack_from(self.map, record_offset)
+
+        if slot_hash != 0 and len(data) <= value_length:
+            # Existing key, and the new value fits where the old one was.
+            start = self.heap_start + key_offset + key_length
+            self.map[start:start + len(data)] = data
+            self.RECORD.pack_into(self.map, record_offset, slot_hash, key_offset, key_length, len(data))
+            self.heap_garbage += value_length - len(data)
+            self._maybe_compact()
+            self._write_header()
+            return
+
+        key_offset = self._heap_append(encoded + data)
+        # The heap may have been remapped; the slot position is unchanged.
+        self.RECORD.pack_into(self.map, self._record_offset(position), key_hash + 1, key_offset, len(encoded), len(data))
+        if slot_hash != 0:
+            self.heap_garbage += key_length + value_length
+            self._maybe_compact()
+        else:
+            self.count += 1
+            if self.count > self.table_size * self.MAX_LOAD_FACTOR:
+                self._rehash()
+        self._write_header()
+
+    def _heap_append(self, data: bytes) -> int:
+        """
+        Store data at the end of the heap, growing the file if needed.
+        Returns its offset from the start of the heap.
+
+        :complexity: O(len(data)) amortized.
+        """
+        if self.heap_used + len(data) > self.heap_capacity:
+            new_capacity = max(2 * self.heap_capacity, self.heap_used + len(data))
+            self.map.close()
+            self.file.truncate(self.heap_start + new_capacity)
+            self.map = mmap.mmap(self.file.fileno(), 0)
+            self.heap_capacity = new_capacity
+        offset = self.heap_used
+        start = self.heap_start + offset
+        self.map[start:start + len(data)] = data
+        self.heap_used += len(data)
+        return offset
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, re-placing the rest of its cluster.
+
+        :complexity best: O(len(key)) deleting item is not probed and in correct spot.
+        :complexity worst: O(N*len(key)+N^2) deleting item is midway through large chain.
+        :raises KeyError: when the key doesn't exist.
+        :raises ValueError: when hash_function returns a value out of range.
+        """
+        position = self._linear_probe(key.encode("utf-8"), self._hash(key), False)
+        empty = self.RECORD.pack(0, 0, 0, 0)
+        _, _, key_length, value_length = self.RECORD.unpack_from(self.map, self._record_offset(position))
+        self.RECORD.pack_into(self.map, self._record_offset(position), 0, 0, 0, 0)
+        self.count -= 1
+        self.heap_garbage += key_length + value_length
+        position = (position + 1) % self.table_size
+        while True:
+            offset = self._record_offset(position)
+            record = self.map[offset:offset + self.RECORD.size]
+            if record[:8] == empty[:8]:
+                break
+            self.map[offset:offset + self.RECORD.size] = empty
+            self._place(record)
+            position = (position + 1) % self.table_size
+        self._maybe_compact()
+        self._write_header()
+
+    def _place(self, record: bytes) -> None:
+        """
+        Store a packed slot record whose key is known not to be in the table, using its stored hash.
+        No keys are compared.
+        """
+        position = (self.RECORD.unpack_from(record)[0] - 1) % self.table_size
+        while True:
+            offset = self._record_offset(position)
+            if self.RECORD.unpack_from(self.map, offset)[0] == 0:
+                self.map[offset:offset + self.RECORD.size] = record
+                return
+            position = (position + 1) % self.table_size
+
+    def _maybe_compact(self) -> None:
+        """
+        Rewrite the table at its current size if more than half of the heap is garbage
+        (and the heap is bigger than MIN_HEAP_CAPACITY). Each rewrite is paid for by at
+        least as many garbage bytes as there are live ones.
+
+        :complexity: O(1) if there is not enough garbage, otherwise see _rehash.
+        """
+        if self.heap_used > self.MIN_HEAP_CAPACITY and 2 * self.heap_garbage > self.heap_used:
+            self._rehash(self.table_size)
+
+    def _rehash(self, new_size: int | None = None) -> None:
+        """
+        Rewrite the table into a new file with new_size slots (by default, the next table
+        size), dropping heap garbage, then replace the old file with it.
+
+        :complexity best: O(N + B) No probing, where B is the size of the live keys and values.
+        :complexity worst: O(N^2 + B) Lots of probing.
+        """
+        if new_size is None:
+            new_size = self._size_for(2 * self.count)
+        tmp_path = self.path + ".rehash"
+        live = self.heap_used - self.heap_garbage
+        self._write_empty(tmp_path, new_size, max(self.MIN_HEAP_CAPACITY, 2 * live))
+        new_table = MmapTable(tmp_path, self.hash_function)
+        for key_hash, key_and_value, key_length in self._entries():
+            offset = new_table._heap_append(key_and_value)
+            new_table._place(self.RECORD.pack(key_hash, offset, key_length, len(key_and_value) - key_length))
+        new_table.count = self.count
+        new_table.close()
+        self.map.close()
+        self.file.close()
+        os.replace(tmp_path, self.path)
+        self.__init__(self.path, self.hash_function)
+
+    def _entries(self) -> Iterator[tuple[int, bytes, int]]:
+        """ Yields (stored hash, key and value bytes, key length) for every occupied slot. """
+        for position in range(self.table_size):
+            slot_hash, key_offset, key_length, value_length = self.RECORD.unpack_from(self.map, self._record_offset(position))
+            if slot_hash != 0:
+                start = self.heap_start + key_offset
+                yield slot_hash, self.map[start:start + key_length + value_length], key_length
+
+    def items(self) -> Iterator[tuple[str, bytes]]:
+        """
+        Lazily yields all (key, value) pairs in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        for _, key_and_value, key_length in self._entries():
+            yield key_and_value[:key_length].decode("utf-8"), key_and_value[key_length:]
+
+    def keys(self) -> list[str]:
+        """
+        Returns all keys in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return [key for key, _ in self.items()]
+
+    def values(self) -> list[bytes]:
+        """
+        Returns all values in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return [value for _, value in self.items()]
@@ -23,6 +23,7 @@ class TreeNode(Generic[K, I]):
         self.item = item
         self.left = None
         self.right = None
+        self.size = 1  # number of nodes in the subtree rooted here
 
     def __str__(self):
         """
@@ -0,0 +1,142 @@
+""" Persistent Binary Search Tree.
+    Defines an AVL tree whose updates copy the nodes they change instead of modifying
+    them, so that snapshots of the tree never change.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Generic
+from data_structures.avl import AVLTree
+from data_structures.bst import K, I
+from data_structures.node import AVLTreeNode
+
+
+class PersistentBST(AVLTree[K, I], Generic[K, I]):
+    """ Persistent (path-copying) AVL tree.
+
+        Nodes are never modified once they are part of the tree. An insertion or deletion
+        builds new copies of the O(log N) nodes on the path it changes, rebalancing them
+        as an AVL tree would, shares every other sub-tree with the previous version, and
+        then replaces the root in one assignment.
+
+        snapshot() therefore costs O(1): it returns a tree holding the current root, which
+        later updates never touch. Readers can use a snapshot while a writer keeps updating
+        the original tree, and the nodes that only old versions use are garbage-collected
+        once the last snapshot holding them is dropped. Updates themselves are not
+        synchronised: there must be only one writer at a time. split, join and
+        delete_range copy nodes in the same way, so they leave snapshots intact too.
+    """
+
+    def snapshot(self) -> PersistentBST[K, I]:
+        """
+            Get a version of the tree that later updates to this tree do not change.
+            :complexity: O(1)
+        """
+        root = self.root
+        version = type(self)()
+        version.root = root
+        version.length = self.get_size(root)
+        return version
+
+    def _copy_node(self, key: K, item: I, left: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+            Create a node with the given children, computing its height and size.
+            :complexity: O(1)
+        """
+        current = AVLTreeNode(key, item)
+        current.left = left
+        current.right = right
+        current.height = 1 + max(self.get_height(left), self.get_height(right))
+        current.size = 1 + self.get_size(left) + self.get_size(right)
+        return current
+
+    def _balanced_node(self, key: K, item: I, left: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+            Create a sub-tree holding key, left and right, whose heights differ by at most two,
+            rotating as AVLTree.rebalance does but with new nodes in place of the moved ones.
+            :complexity: O(1)
+        """
+        balance = self.get_height(right) - self.get_height(left)
+        if balance >= 2:
+            if self.get_balance(right) < 0:
+                # right-left case
+                centre = right.left
+                return self._copy_node(centre.key, centre.item,
+                                       self._copy_node(key, item, left, centre.left),
+                                       self._copy_node(right.key, right.item, centre.right, right.right))
+            return self._copy_node(right.key, right.item, self._copy_node(key, item, left, right.left), right.right)
+
+        if balance <= -2:
+            if self.get_balance(left) > 0:
+                # left-right case
+                centre = left.right
+                return self._copy_node(centre.key, centre.item,
+                                       self._copy_node(left.key, left.item, left.left, centre.left),
+                                       self._copy_node(key, item, centre.right, right))
+            return self._copy_node(left.key, left.item, left.left, self._copy_node(key, item, left.right, right))
+
+        return self._copy_node(key, item, left, right)
+
+    def _join_with_key(self, left: AVLTreeNode, current: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+            Join left, a copy of current and right into a balanced sub-tree as AVLTree does,
+            copying the nodes on the spine it descends instead of modifying them.
+            :complexity: O(|height(left) - height(right)| + 1)
+        """
+        left_height, right_height = self.get_height(left), self.get_height(right)
+        if left_height > right_height + 1:
+            return self._balanced_node(left.key, left.item, left.left,
+                                       self._join_with_key(left.right, current, right))
+        if right_height > left_height + 1:
+            return self._balanced_node(right.key, right.item,
+                                       self._join_with_key(left, current, right.left), right.right)
+        return self._copy_node(current.key, current.item, left, right)
+
+    def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
+        """
+            Returns a copy of the sub-tree current with the item inserted, sharing
+            the sub-trees off the insertion path.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+            :raises ValueError: if the key is already in the tree.
+        """
+        if current is None:  # base case: at the leaf
+            self.length += 1
+            return self._copy_node(key, item, None, None)
+        elif key < current.key:
+            return self._balanced_node(current.key, current.item,
+                                       self.insert_aux(current.left, key, item), current.right)
+        elif key > current.key:
+            return self._balanced_node(current.key, current.item,
+                                       current.left, self.insert_aux(current.right, key, item))
+        else:  # key == current.key
+            raise ValueError('Inserting duplicate item')
+
+    def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
+        """
+            Returns a copy of the sub-tree current with the key deleted, sharing
+            the sub-trees off the deletion path.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+            :raises ValueError: if the key is not in the tree.
+        """
+        if current is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+        elif key < current.key:
+            return self._balanced_node(current.key, current.item,
+                                       self.delete_aux(current.left, key), current.right)
+        elif key > current.key:
+            return self._balanced_node(current.key, current.item,
+                                       current.left, self.delete_aux(current.right, key))
+
+        # we found our key => drop it, sharing its children
+        if current.left is None:
+            self.length -= 1
+            return current.right
+        elif current.right is None:
+            self.length -= 1
+            return current.left
+
+        # general case => a copy of the successor takes its place
+        succ = self.get_successor(current)
+        return self._balanced_node(succ.key, succ.item, current.left, self.delete_aux(current.right, succ.key))
@@ -12,17 +12,32 @@ space to hold the references.
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
+
+A fresh py_object array holds NULL pointers, which cannot be read, so every
+slot has to be set to None. For small arrays this is a slice assignment; for
+large ones the first slot is set and then copied over the rest of the buffer
+with memmove, doubling the filled prefix each time, so the fill runs at C
+speed instead of going through a Python list of length Nones. This is the same
+state a slice assignment leaves: ctypes keeps no reference for None, and None
+is never deallocated.
+
+Slices, copy_from and iteration go straight to the ctypes array as well, so
+bulk reads and copies do not make a Python call per element.
 """
+from __future__ import annotations
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
-from ctypes import py_object
-from typing import TypeVar, Generic
+from ctypes import addressof, memmove, py_object, sizeof
+from typing import TypeVar, Generic, Iterator, Sequence
 
 T = TypeVar('T')
 
 
 class ArrayR(Generic[T]):
+    # Below this length, filling through a list of Nones is cheaper than memmove calls.
+    MEMMOVE_FILL_THRESHOLD = 512
+
     def __init__(self, length: int) -> None:
         """ Creates an array of references to objects of the given length
         :complexity: O(length) for best/worst case to initialise to None
@@ -31,7 +46,15 @@ class ArrayR(Generic[T]):
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
         self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        if length < self.MEMMOVE_FILL_THRESHOLD:
+            self.array[:] = [None] * length
+        else:
+            self.array[0] = None
+            start, slot, filled = addressof(self.array), sizeof(py_object), 1
+            while filled < length:
+                chunk = min(filled, length - filled)
+                memmove(start + filled * slot, start, chunk * slot)
+                filled += chunk
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -39,16 +62,34 @@ class ArrayR(Generic[T]):
         """
         return len(self.array)
 
-    def __getitem__(self, index: int) -> T:
-        """ Returns the object in position index.
-        :complexity: O(1)
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """ Returns the object in position index, or a list of the objects in a slice.
+        :complexity: O(1), or O(len(slice)) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
         return self.array[index]
 
-    def __setitem__(self, index: int, value: T) -> None:
-        """ Sets the object in position index to value
-        :complexity: O(1)
+    def __setitem__(self, index: int | slice, value: T | Sequence[T]) -> None:
+        """ Sets the object in position index to value. For a slice, value must be a
+        sequence of the same length as the slice.
+        :complexity: O(1), or O(len(slice)) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
         self.array[index] = value
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the objects in the array, without a Python call per element.
+        :complexity: O(length)
+        """
+        return iter(self.array)
+
+    def copy_from(self, other: ArrayR[T] | Sequence[T], src: int, dst: int, n: int) -> None:
+        """ Copies other[src:src + n] into self[dst:dst + n]. other may be this array,
+        and the two ranges may overlap.
+        :complexity: O(n)
+        :raises IndexError: if either range does not fit in its array.
+        """
+        if src < 0 or dst < 0 or n < 0 or src + n > len(other) or dst + n > len(self):
+            raise IndexError("Cannot copy {0} elements from {1} to {2}.".format(n, src, dst))
+        if n > 0:
+            self.array[dst:dst + n] = other[src:src + n]
@@ -0,0 +1,154 @@
+""" Robin Hood Hash Table
+
+Defines a Hash Table using Robin Hood linear probing for conflict resolution,
+with backward-shift deletion.
+"""
+from __future__ import annotations
+
+from data_structures.hash_table import LinearProbeTable, FullError, K, V
+
+
+class RobinHoodTable(LinearProbeTable[K, V]):
+    """
+    Robin Hood Linear Probe Table.
+
+    Behaves exactly like LinearProbeTable, but while inserting, an entry that has
+    probed further from its home slot than the entry occupying a slot takes that slot,
+    and the displaced entry continues probing. This keeps every entry's probe distance
+    close to the average, so the variance (and the maximum) of probe lengths stays low
+    even at high load factors, and unsuccessful lookups can stop as soon as they reach an
+    entry closer to its home than the key being searched for would be.
+
+    Deletion uses backward shifting: the entries after the removed one are moved back a
+    slot until an empty slot or an entry already in its home slot is reached, so no
+    tombstones are needed and no entry has to be re-probed.
+    """
+
+    def _linear_probe(self, key: K, is_insert: bool, key_hash: int | None = None) -> int:
+        """
+        Find the position of this key in the hash table.
+        If the key is missing and is_insert is True, return the slot it would be inserted at
+        (entries from there onwards are shifted along by __setitem__).
+        :complexity best: O(hash(key)) first position is empty
+        :complexity worst: O(hash(key) + D*comp(K)) where D is the longest probe distance in the table
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        if key_hash is None:
+            key_hash = self._full_hash(key)
+        array = self.array
+        size = self.table_size
+        position = key_hash % size
+
+        for distance in range(size):
+            entry = array[position]
+            if entry is None or (position - entry[2]) % size < distance:
+                # Empty, or an entry richer than us: the key would have been placed here.
+                if is_insert:
+                    return position
+                raise KeyError(key)
+            elif entry[2] == key_hash and (entry[0] is key or entry[0] == key):
+                return position
+            position = (position + 1) % size
+
+        if is_insert:
+            raise FullError("Table is full!")
+        raise KeyError(key)
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See linear probe, plus O(C) to shift along the rest of the cluster of length C.
+        :raises FullError: when the table cannot be resized further.
+        """
+        key_hash = self._full_hash(key)
+        if self.old_array is not None:
+            self._rehash_step(key, key_hash)
+        position = self._linear_probe(key, True, key_hash)
+        entry = self.array[position]
+
+        if entry is not None and entry[2] == key_hash and (entry[0] is key or entry[0] == key):
+            self.array[position] = (key, data, key_hash)
+            return
+
+        if self.count == self.table_size:
+            raise FullError("Table is full!")
+        if entry is not None:
+            # Evict the richer entry and carry it along the cluster.
+            order = self.order_array[position] if self.order_array is not None else None
+        self.array[position] = (key, data, key_hash)
+        self.count += 1
+        if entry is not None:
+            self._place_from(entry, order, (position + 1) % self.table_size)
+        if self.order_array is not None:
+            self._append_order(position)
+
+        if len(self) > self.table_size * self.MAX_LOAD_FACTOR:
+            self._rehash()
+
+    def _place(self, item: tuple[K, V, int], order: int | None = None) -> None:
+        """
+        Store an entry whose key is known not to be in the table, using its stored hash.
+        :complexity: O(C) where C is the length of the cluster it lands in.
+        """
+        self._place_from(item, order, item[2] % self.table_size)
+
+    def _place_from(self, item: tuple[K, V, int], order: int | None, position: int) -> None:
+        """
+        Robin Hood insertion of an entry known not to be in the table, starting at position.
+        order is the entry's index in dense_slots, if the table is ordered.
+        :pre: the table has at least one empty slot.
+        :complexity: O(C) where C is the length of the cluster it lands in.
+        """
+        array, orders = self.array, self.order_array
+        size = self.table_size
+        distance = (position - item[2]) % size
+        while True:
+            entry = array[position]
+            if entry is None:
+                array[position] = item
+                if order is not None:
+                    self._set_order(position, order)
+                return
+            entry_distance = (position - entry[2]) % size
+            if entry_distance < distance:
+                array[position] = item
+                item, distance = entry, entry_distance
+                if orders is not None:
+                    evicted_order = orders[position]
+                    self._set_order(position, order)
+                    order = evicted_order
+            position = (position + 1) % size
+            distance += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, shifting the rest of the cluster back.
+
+        :complexity best: O(hash(key)) the next slot is empty or holds an entry in its home slot.
+        :complexity worst: O(hash(key) + D*comp(K) + C) where D is the longest probe distance
+                           and C is the length of the cluster after the deleted item.
+        :raises KeyError: when the key doesn't exist.
+        """
+        key_hash = self._full_hash(key)
+        if self.old_array is not None:
+            self._rehash_step(key, key_hash)
+        array = self.array
+        size = self.table_size
+        position = self._linear_probe(key, False, key_hash)
+        if self.order_array is not None:
+            self._drop_order(position)
+        self.count -= 1
+        following = (position + 1) % size
+        while True:
+            entry = array[following]
+            if entry is None or entry[2] % size == following:
+                break
+            array[position] = entry
+            if self.order_array is not None:
+                self._set_order(position, self.order_array[following])
+            position = following
+            following = (following + 1) % size
+        self._clear_slot(position)
+        self._maybe_shrink()
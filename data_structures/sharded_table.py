@@ -0,0 +1,156 @@
+""" Sharded Hash Table
+
+Defines a thread-safe Hash Table made of lock-striped LinearProbeTable shards.
+"""
+from __future__ import annotations
+
+from threading import Lock
+from typing import Callable, Generic, Iterator
+from data_structures.hash_table import LinearProbeTable, K, V
+from data_structures.referential_array import ArrayR
+
+
+class ShardedTable(Generic[K, V]):
+    """
+    Sharded Linear Probe Table, safe to share between threads.
+
+    Keys are routed by hash to one of `n_shards` LinearProbeTables, each guarded by its
+    own lock, so writers only contend when they hit the same shard, and each shard
+    resizes on its own.
+
+    Reads do not take the lock. Every shard has a version counter that writers bump
+    before and after each change (so it is odd while a change is in progress); a read
+    notes the version, looks the key up, and only trusts the result if the version is
+    even and unchanged afterwards. Otherwise (or if the lookup tripped over a half-made
+    change) it retries under the lock. Lookups in a table that is rehashing incrementally
+    move entries, so with `incremental_rehash=True` reads always take the lock.
+
+    Other keyword arguments are passed to each shard's constructor.
+    The hash function defaults to the builtin `hash`.
+    """
+
+    DEFAULT_SHARDS = 16
+
+    def __init__(self, n_shards: int = DEFAULT_SHARDS, hash_function: Callable[[K], int] = hash, **table_kwargs) -> None:
+        """
+        :raises ValueError: if n_shards < 1.
+        :complexity: O(n_shards)
+        """
+        if n_shards < 1:
+            raise ValueError("A sharded table needs at least one shard.")
+        self.hash_function = hash_function
+        self.n_shards = n_shards
+        self.shards:ArrayR[LinearProbeTable[K, V]] = ArrayR(n_shards)
+        self.locks:ArrayR[Lock] = ArrayR(n_shards)
+        self.versions:list[int] = [0] * n_shards
+        for i in range(n_shards):
+            self.shards[i] = LinearProbeTable(hash_function=hash_function, **table_kwargs)
+            self.locks[i] = Lock()
+        self.lock_free_reads = not table_kwargs.get("incremental_rehash", False)
+
+    def _shard_index(self, key: K) -> int:
+        return self.hash_function(key) % self.n_shards
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements across all shards.
+        Shards are counted one after the other, so this is not a snapshot while writers are active.
+        :complexity: O(n_shards)
+        """
+        return sum(len(self.shards[i]) for i in range(self.n_shards))
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key.
+
+        :complexity: See LinearProbeTable.__getitem__.
+        :raises KeyError: when the key doesn't exist.
+        """
+        i = self._shard_index(key)
+        shard = self.shards[i]
+        if self.lock_free_reads:
+            version = self.versions[i]
+            if version % 2 == 0:
+                try:
+                    value = shard[key]
+                except KeyError:
+                    if self.versions[i] == version:
+                        raise
+                except Exception:
+                    # Saw the shard mid-change; fall back to the lock.
+                    pass
+                else:
+                    if self.versions[i] == version:
+                        return value
+        with self.locks[i]:
+            return shard[key]
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the table.
+
+        :complexity: See __getitem__.
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair, holding only the lock of the key's shard.
+
+        :complexity: See LinearProbeTable.__setitem__.
+        """
+        i = self._shard_index(key)
+        with self.locks[i]:
+            self.versions[i] += 1
+            try:
+                self.shards[i][key] = data
+            finally:
+                self.versions[i] += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair, holding only the lock of the key's shard.
+
+        :complexity: See LinearProbeTable.__delitem__.
+        :raises KeyError: when the key doesn't exist.
+        """
+        i = self._shard_index(key)
+        with self.locks[i]:
+            self.versions[i] += 1
+            try:
+                del self.shards[i][key]
+            finally:
+                self.versions[i] += 1
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Yields all (key, value) pairs, shard by shard.
+        Each shard is copied under its lock, so the lock is not held while the caller consumes the items.
+
+        :complexity: O(S) where S is the total size of the shards.
+        """
+        for i in range(self.n_shards):
+            with self.locks[i]:
+                shard_items = list(self.shards[i].items())
+            yield from shard_items
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the table.
+
+        :complexity: See items.
+        """
+        return [key for key, _ in self.items()]
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the table.
+
+        :complexity: See items.
+        """
+        return [value for _, value in self.items()]
@@ -0,0 +1,66 @@
+""" Fixed-type numeric arrays.
+
+ArrayR stores references, so every number in it is a separate boxed Python object.
+ArrayF, ArrayI and ArrayU store 64-bit floats, signed and unsigned integers
+unboxed, in one contiguous buffer. They are array.array subclasses, so they
+support the buffer protocol: memoryview, struct.pack_into/unpack_from,
+file.readinto/write and numpy.frombuffer all work on them without copying.
+
+Like ArrayR they are created zero-filled with a fixed length, from a bytes object of
+the right size, so creating them never builds a list.
+"""
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+from array import array
+
+
+class _TypedArray(array):
+    TYPECODE = ''
+
+    def __new__(cls, length: int) -> _TypedArray:
+        """ Creates a zero-filled array of the given length
+        :complexity: O(length)
+        :pre: length > 0
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        return super().__new__(cls, cls.TYPECODE, bytes(length * cls.ITEMSIZE))
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        cls.ITEMSIZE = array(cls.TYPECODE).itemsize
+
+    def __reduce__(self):
+        """ array.array pickles itself by typecode, which __new__ does not take. """
+        return _from_bytes, (type(self), self.tobytes())
+
+    def __copy__(self) -> _TypedArray:
+        """ array.array would copy into a plain array. """
+        return _from_bytes(type(self), self.tobytes())
+
+    def __deepcopy__(self, memo) -> _TypedArray:
+        return self.__copy__()
+
+
+def _from_bytes(cls: type[_TypedArray], data: bytes) -> _TypedArray:
+    """
+    Rebuild a typed array from its raw bytes (used by pickling and copying).
+    This bypasses __new__, so an array emptied with del can be copied too.
+    """
+    return array.__new__(cls, cls.TYPECODE, data)
+
+
+class ArrayF(_TypedArray):
+    """ Array of 64-bit floats. """
+    TYPECODE = 'd'
+
+
+class ArrayI(_TypedArray):
+    """ Array of 64-bit signed integers. """
+    TYPECODE = 'q'
+
+
+class ArrayU(_TypedArray):
+    """ Array of 64-bit unsigned integers, e.g. for words of bits. """
+    TYPECODE = 'Q'
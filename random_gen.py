@@ -5,6 +5,8 @@ __author__ = "Jackson Goerner"
 
 import time
 
+from data_structures.referential_array import ArrayR
+
 class RandomGen():
     """
     Class used to generate (seeded) random numbers for interesting outcomes and repeatable tests.
@@ -61,11 +63,17 @@ class RandomGen():
     @classmethod
     def random_shuffle(cls, collection) -> None:
         """
-        Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__
+        Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__.
+        A list or an ArrayR is read and written back in bulk, with one slice assignment;
+        any other collection is shuffled element by element. Both give the same permutation.
         :complexity: O(len(collection))
         """
         positions = [(RandomGen.random(), i) for i in range(len(collection))]
         positions.sort() # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
-        tmp = [collection[p[1]] for p in positions]
-        for x in range(len(collection)):
-            collection[x] = tmp[x]
+        if isinstance(collection, (list, ArrayR)):
+            values = list(collection)
+            collection[0:len(values)] = [values[p[1]] for p in positions]
+        else:
+            tmp = [collection[p[1]] for p in positions]
+            for x in range(len(collection)):
+                collection[x] = tmp[x]
@@ -0,0 +1,146 @@
+import copy
+import pickle
+import struct
+from unittest import TestCase
+
+from data_structures.dynamic_array import DynamicArrayR
+from data_structures.referential_array import ArrayR
+from data_structures.typed_array import ArrayF, ArrayI, ArrayU
+
+
+class ArrayTests(TestCase):
+
+    def test_fill(self):
+        threshold = ArrayR.MEMMOVE_FILL_THRESHOLD
+        for length in (1, 2, threshold - 1, threshold, threshold + 1, 3 * threshold + 7, 10**5):
+            array = ArrayR(length)
+            self.assertEqual(len(array), length)
+            self.assertTrue(all(array[i] is None for i in range(length)))
+            array[0] = "first"
+            array[length - 1] = "last"
+            self.assertEqual(array[length - 1], "last")
+            if length > 1:
+                self.assertEqual(array[0], "first")
+                self.assertTrue(all(array[i] is None for i in range(1, length - 1)))
+        for length in (0, -1):
+            with self.assertRaises(ValueError):
+                ArrayR(length)
+
+    def filled(self, values: list) -> ArrayR:
+        array = ArrayR(len(values))
+        for i, value in enumerate(values):
+            array[i] = value
+        return array
+
+    def test_slices(self):
+        array = self.filled(list(range(10)))
+        self.assertEqual(array[2:5], [2, 3, 4])
+        self.assertEqual(array[:], list(range(10)))
+        self.assertEqual(array[::3], [0, 3, 6, 9])
+        self.assertEqual(array[8:20], [8, 9])
+        self.assertEqual(array[5:5], [])
+        self.assertEqual(list(array), list(range(10)))
+
+        array[2:5] = ["a", "b", "c"]
+        self.assertEqual(list(array), [0, 1, "a", "b", "c", 5, 6, 7, 8, 9])
+        array[::2] = [None] * 5
+        self.assertEqual(list(array), [None, 1, None, "b", None, 5, None, 7, None, 9])
+        # A slice is replaced in place, so the value must have the slice's length.
+        with self.assertRaises(ValueError):
+            array[0:3] = [1, 2]
+        self.assertEqual(len(array), 10)
+
+    def test_copy_from(self):
+        array = self.filled(list(range(10)))
+        # Overlapping copies within one array behave like a memmove, in either direction.
+        array.copy_from(array, 0, 2, 6)
+        self.assertEqual(list(array), [0, 1, 0, 1, 2, 3, 4, 5, 8, 9])
+        array.copy_from(array, 4, 1, 6)
+        self.assertEqual(list(array), [0, 2, 3, 4, 5, 8, 9, 5, 8, 9])
+
+        other = self.filled(["x", "y", "z"])
+        array.copy_from(other, 1, 8, 2)
+        self.assertEqual(array[7:], [5, "y", "z"])
+        array.copy_from(["p", "q"], 0, 0, 2)
+        self.assertEqual(array[:3], ["p", "q", 3])
+        array.copy_from(other, 3, 10, 0)
+        for src, dst, n in ((0, 9, 2), (2, 0, 2), (-1, 0, 1), (0, -1, 1), (0, 0, -1), (0, 0, 4)):
+            with self.assertRaises(IndexError):
+                array.copy_from(other, src, dst, n)
+        self.assertEqual(list(array), ["p", "q", 3, 4, 5, 8, 9, 5, "y", "z"])
+
+    def test_dynamic_array(self):
+        array = DynamicArrayR()
+        for i in range(100):
+            array.append(i * i)
+        self.assertEqual(len(array), 100)
+        self.assertEqual(array.capacity, 128)
+        self.assertEqual(array.resize_count, 7)
+        self.assertEqual([array[i] for i in range(100)], [i * i for i in range(100)])
+        array[5] = "five"
+        self.assertEqual(array[5], "five")
+        # Only 0 .. len - 1 can be used, even with spare capacity.
+        for index in (-1, 100, 127):
+            with self.assertRaises(IndexError):
+                _ = array[index]
+            with self.assertRaises(IndexError):
+                array[index] = 0
+
+        self.assertEqual(array.pop(), 99 * 99)
+        self.assertEqual(len(array), 99)
+        self.assertEqual(array.capacity, 128)
+        with self.assertRaises(IndexError):
+            _ = array[99]
+        array.resize(99)
+        self.assertEqual(array.capacity, 99)
+        self.assertEqual(array[98], 98 * 98)
+        with self.assertRaises(ValueError):
+            array.resize(98)
+        while len(array) > 0:
+            array.pop()
+        with self.assertRaises(IndexError):
+            array.pop()
+        with self.assertRaises(ValueError):
+            array.resize(0)
+
+        array = DynamicArrayR(1000)
+        self.assertEqual(array.capacity, 1000)
+        for i in range(1000):
+            array.append(i)
+        self.assertEqual(array.resize_count, 0)
+
+    def test_typed_arrays(self):
+        for array_type, typecode, values in ((ArrayF, 'd', [1.5, -2.25, 1e300]),
+                                             (ArrayI, 'q', [-2**63, 2**63 - 1, 7]),
+                                             (ArrayU, 'Q', [0, 2**64 - 1, 7])):
+            array = array_type(1000)
+            self.assertEqual(array.typecode, typecode)
+            self.assertEqual(array.ITEMSIZE, 8)
+            self.assertEqual(len(array), 1000)
+            self.assertTrue(all(x == 0 for x in array))
+            array[0:3] = array_type(3)
+            for i, value in enumerate(values):
+                array[i] = value
+            self.assertEqual(list(array[:3]), values)
+
+            # The buffer protocol sees the raw, unboxed values.
+            with memoryview(array) as view:
+                self.assertEqual((view.format, view.itemsize, view.nbytes), (typecode, 8, 8000))
+            self.assertEqual(list(struct.unpack_from("<3" + typecode, array)), values)
+            struct.pack_into("<" + typecode, array, 8 * 999, values[1])
+            self.assertEqual(array[999], values[1])
+
+            # Pickling and copying keep the type and the contents.
+            for clone in (pickle.loads(pickle.dumps(array)), copy.copy(array), copy.deepcopy(array)):
+                self.assertIs(type(clone), array_type)
+                self.assertEqual(clone, array)
+                self.assertIsNot(clone, array)
+            clone[0] = 0
+            self.assertEqual(array[0], values[0])
+            del array[:]
+            self.assertEqual(len(copy.copy(array)), 0)
+            self.assertEqual(len(pickle.loads(pickle.dumps(array))), 0)
+            with self.assertRaises(ValueError):
+                array_type(0)
+        with self.assertRaises(OverflowError):
+            ArrayU(1)[0] = -1
@@ -0,0 +1,159 @@
+from unittest import TestCase
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.robin_hood_table import RobinHoodTable
+from random_gen import RandomGen
+
+
+class IntKeyTable(LinearProbeTable):
+    """ A table for int keys written against the original API, by overriding hash. """
+
+    def hash(self, key: int) -> int:
+        return key % self.table_size
+
+
+class HashTableTests(TestCase):
+
+    def run_against_dict(self, table: LinearProbeTable, n_ops: int = 3000, n_keys: int = 300, check_order: bool = False) -> dict:
+        """ Apply random inserts, updates, deletes and lookups to table and to a dict, comparing them throughout. """
+        RandomGen.set_seed(7)
+        expected = {}
+        for i in range(n_ops):
+            key = "island-{0}".format(RandomGen.randint(0, n_keys))
+            op = RandomGen.randint(0, 9)
+            if op < 5:
+                table[key] = i
+                expected[key] = i
+            elif op < 8:
+                if key in expected:
+                    del table[key]
+                    del expected[key]
+                else:
+                    with self.assertRaises(KeyError):
+                        del table[key]
+            else:
+                self.assertEqual(key in table, key in expected)
+                if key in expected:
+                    self.assertEqual(table[key], expected[key])
+                else:
+                    with self.assertRaises(KeyError):
+                        _ = table[key]
+            self.assertEqual(len(table), len(expected))
+            if i % 101 == 0:
+                self.check_contents(table, expected, check_order)
+        self.check_contents(table, expected, check_order)
+        return expected
+
+    def check_contents(self, table: LinearProbeTable, expected: dict, check_order: bool) -> None:
+        if check_order:
+            self.assertEqual(list(table.items()), list(expected.items()))
+            self.assertEqual(table.keys(), list(expected.keys()))
+        else:
+            self.assertEqual(sorted(table.items()), sorted(expected.items()))
+            self.assertEqual(sorted(table.values()), sorted(expected.values()))
+
+    def test_linear_probe(self):
+        self.run_against_dict(LinearProbeTable())
+        self.run_against_dict(LinearProbeTable(hash_function=hash))
+
+    def test_robin_hood(self):
+        table = RobinHoodTable(hash_function=hash)
+        self.run_against_dict(table)
+        # An entry away from its home slot is at most one slot further from home than the entry before it.
+        size = table.table_size
+        for position in range(size):
+            entry = table.array[position]
+            if entry is not None and (position - entry[2]) % size > 0:
+                previous = table.array[(position - 1) % size]
+                self.assertIsNotNone(previous)
+                self.assertGreaterEqual((position - 1 - previous[2]) % size + 1, (position - entry[2]) % size)
+
+    def test_robin_hood_high_load(self):
+        table = RobinHoodTable(max_load_factor=0.9, hash_function=hash)
+        for i in range(2000):
+            table[str(i)] = i
+        for i in range(0, 2000, 3):
+            del table[str(i)]
+        for i in range(2000):
+            self.assertEqual(str(i) in table, i % 3 != 0)
+
+    def test_incremental_rehash(self):
+        table = LinearProbeTable(incremental_rehash=True)
+        saw_migration = False
+        for i in range(500):
+            table[str(i)] = i
+            saw_migration = saw_migration or table.old_array is not None
+            for j in range(0, i + 1, 37):
+                self.assertEqual(table[str(j)], j)
+        self.assertTrue(saw_migration)
+        self.run_against_dict(LinearProbeTable(incremental_rehash=True))
+        self.run_against_dict(RobinHoodTable(incremental_rehash=True))
+
+    def test_slot_layout(self):
+        table = LinearProbeTable(hash_function=hash)
+        for i in range(100):
+            table[str(i)] = i
+        # Each occupied slot is a single (key, value, full hash) tuple.
+        entries = [table.array[position] for position in range(table.table_size) if table.array[position] is not None]
+        self.assertEqual(sorted(entries), sorted((str(i), i, hash(str(i))) for i in range(100)))
+        del table["7"]
+        table["8"] = "eight"
+        self.assertIn(("8", "eight", hash("8")), [table.array[position] for position in range(table.table_size)])
+
+    def test_ordered(self):
+        self.run_against_dict(LinearProbeTable(ordered=True), check_order=True)
+        self.run_against_dict(LinearProbeTable(ordered=True, incremental_rehash=True), check_order=True)
+        self.run_against_dict(RobinHoodTable(ordered=True, hash_function=hash), check_order=True)
+
+    def test_shrink_and_reserve(self):
+        table = LinearProbeTable()
+        for i in range(5000):
+            table[str(i)] = i
+        for i in range(5000):
+            del table[str(i)]
+        self.assertEqual(table.table_size, LinearProbeTable.TABLE_SIZES[0])
+
+        table = LinearProbeTable()
+        table.reserve(100000)
+        reserved_size = table.table_size
+        table["a"] = 1
+        del table["a"]
+        self.assertEqual(table.table_size, reserved_size)
+        stats = table.enable_stats()
+        for i in range(100000):
+            table[str(i)] = i
+        self.assertEqual(stats.rehash_count, 0)
+
+    def test_from_items(self):
+        items = [(str(i), i) for i in range(1000)]
+        table = LinearProbeTable.from_items(items, hash_function=hash)
+        stats = table.enable_stats()
+        self.assertEqual(sorted(table.items()), sorted(items))
+        self.assertEqual(stats.rehash_count, 0)
+
+    def test_overridden_hash(self):
+        table = IntKeyTable()
+        for i in range(0, 3000, 7):
+            table[i] = str(i)
+        for i in range(0, 3000, 14):
+            del table[i]
+        for i in range(3000):
+            self.assertEqual(i in table, i % 7 == 0 and i % 14 != 0)
+        with self.assertRaises(ValueError):
+            IntKeyTable(incremental_rehash=True)
+
+    def test_stats(self):
+        table = LinearProbeTable(hash_function=hash)
+        stats = table.enable_stats()
+        for i in range(200):
+            table[str(i)] = i
+        for i in range(300):
+            _ = str(i) in table
+        # Inserting a new key is an unsuccessful probe.
+        self.assertEqual(stats.successful, 200)
+        self.assertEqual(stats.unsuccessful, 200 + 100)
+        self.assertGreater(stats.rehash_count, 0)
+        self.assertEqual(sum(stats.probe_histogram), stats.successful + stats.unsuccessful)
+        self.assertEqual(sum(size * count for size, count in enumerate(table.cluster_sizes())), len(table))
+        self.assertIs(table.disable_stats(), stats)
+        self.assertNotIn("_linear_probe", table.__dict__)
@@ -0,0 +1,275 @@
+import heapq
+import pickle
+from operator import itemgetter
+from unittest import TestCase
+
+from data_structures.dary_heap import DaryHeap
+from data_structures.heap import MaxHeap, MinHeap, TopK, nlargest
+from data_structures.referential_array import ArrayR
+from random_gen import RandomGen
+
+
+def random_ints(n: int, high: int = 1000) -> list[int]:
+    return [RandomGen.randint(0, high) for _ in range(n)]
+
+
+def to_array(items: list) -> ArrayR:
+    array = ArrayR(len(items))
+    for i, item in enumerate(items):
+        array[i] = item
+    return array
+
+
+def negated(element: int) -> int:
+    """ A key that can be pickled, unlike a lambda. """
+    return -element
+
+
+class HeapTests(TestCase):
+
+    def drain(self, heap) -> list:
+        """ Remove every element from heap, in the order it gives them back. """
+        out = []
+        while len(heap) > 0:
+            out.append(heap.get_max())
+        return out
+
+    def test_max_heap_against_heapq(self):
+        RandomGen.set_seed(37)
+        heap, reference = MaxHeap(1), []
+        for _ in range(3000):
+            if RandomGen.randint(0, 2) and reference:
+                self.assertEqual(heap.peek(), -reference[0])
+                self.assertEqual(heap.get_max(), -heapq.heappop(reference))
+            else:
+                element = RandomGen.randint(0, 500)
+                heap.add(element)
+                heapq.heappush(reference, -element)
+            self.assertEqual(len(heap), len(reference))
+        self.assertEqual(self.drain(heap), sorted((-x for x in reference), reverse=True))
+        with self.assertRaises(IndexError):
+            heap.get_max()
+        with self.assertRaises(IndexError):
+            heap.peek()
+
+    def test_growth(self):
+        RandomGen.set_seed(41)
+        items = random_ints(1000)
+        heap = MaxHeap(1)
+        for item in items:
+            heap.add(item)
+        # Doubling from a capacity of 1 up to 1024.
+        self.assertEqual(heap.capacity, 1024)
+        self.assertEqual(heap.grow_count, 10)
+        self.assertEqual(heap.shrink_count, 0)
+        self.assertEqual(self.drain(heap), sorted(items, reverse=True))
+        # Not shrinkable by default.
+        self.assertEqual(heap.capacity, 1024)
+
+        heap = MaxHeap(3, growable=False)
+        for item in [1, 3, 2]:
+            heap.add(item)
+        self.assertTrue(heap.is_full())
+        with self.assertRaises(IndexError):
+            heap.add(4)
+        self.assertEqual(self.drain(heap), [3, 2, 1])
+
+    def test_shrink(self):
+        RandomGen.set_seed(43)
+        items = random_ints(1000)
+        heap = MaxHeap(8, shrinkable=True)
+        for item in items:
+            heap.add(item)
+        self.assertEqual(heap.capacity, 1024)
+        self.assertEqual(self.drain(heap), sorted(items, reverse=True))
+        # Halved down to, but not below, the starting capacity.
+        self.assertEqual(heap.capacity, 8)
+        self.assertEqual(heap.shrink_count, 7)
+        self.assertEqual(heap.resize_count, heap.grow_count + heap.shrink_count)
+
+        # Alternating add and get_max at a capacity boundary does not resize every time.
+        heap = MaxHeap(8, shrinkable=True)
+        for item in range(9):
+            heap.add(item)
+        resizes = heap.resize_count
+        for _ in range(100):
+            heap.get_max()
+            heap.add(9)
+        self.assertEqual(heap.resize_count, resizes)
+
+    def test_heapify(self):
+        RandomGen.set_seed(47)
+        for n in (1, 2, 10, 101):
+            items = random_ints(n)
+            heap = MaxHeap.heapify(to_array(items))
+            self.assertEqual(len(heap), n)
+            heap.add(500)
+            self.assertEqual(self.drain(heap), sorted(items + [500], reverse=True))
+
+    def test_min_heap_against_heapq(self):
+        RandomGen.set_seed(53)
+        heap, reference = MinHeap(1), []
+        for _ in range(3000):
+            if RandomGen.randint(0, 2) and reference:
+                self.assertEqual(heap.peek(), reference[0])
+                self.assertEqual(heap.get_min(), heapq.heappop(reference))
+            else:
+                element = RandomGen.randint(0, 500)
+                heap.add(element)
+                heapq.heappush(reference, element)
+        self.assertEqual(self.drain(heap), sorted(reference))
+
+    def test_key(self):
+        RandomGen.set_seed(59)
+        priorities = list(range(300))
+        RandomGen.random_shuffle(priorities)
+        pairs = [(priority, "island-{0}".format(priority)) for priority in priorities]
+        for heap_type, reverse in ((MaxHeap, True), (MinHeap, False)):
+            heap = heap_type(1, key=itemgetter(0))
+            for pair in pairs:
+                heap.add(pair)
+            # Keys are cached next to the elements, and stay in step through resizes.
+            self.assertEqual([heap.the_keys[k] for k in range(1, len(heap) + 1)],
+                             [heap.the_array[k][0] for k in range(1, len(heap) + 1)])
+            self.assertEqual(self.drain(heap), sorted(pairs, reverse=reverse))
+            heap = heap_type.heapify(to_array(pairs), key=itemgetter(0))
+            self.assertEqual(self.drain(heap), sorted(pairs, reverse=reverse))
+        # Ordering by key only: elements that cannot be compared are fine.
+        heap = MaxHeap(4, key=len)
+        for item in [{1}, {1, 2, 3}, {4, 5}]:
+            heap.add(item)
+        self.assertEqual(heap.get_max(), {1, 2, 3})
+
+    def test_pushpop_and_replace_top(self):
+        RandomGen.set_seed(61)
+        for heap_type, sign in ((MinHeap, 1), (MaxHeap, -1)):
+            # heapq is a min heap: a MaxHeap is checked against it on negated elements.
+            heap, reference = heap_type(1), []
+            for element in random_ints(50):
+                heap.add(element)
+                heapq.heappush(reference, sign * element)
+            for _ in range(500):
+                element = RandomGen.randint(0, 1000)
+                if RandomGen.randint(0, 1):
+                    self.assertEqual(heap.pushpop(element), sign * heapq.heappushpop(reference, sign * element))
+                else:
+                    self.assertEqual(heap.replace_top(element), sign * heapq.heapreplace(reference, sign * element))
+                self.assertEqual(len(heap), 50)
+            self.assertEqual(self.drain(heap), [sign * x for x in sorted(reference)])
+            # On an empty heap pushpop hands the element back, and replace_top has no top to replace.
+            self.assertEqual(heap.pushpop(7), 7)
+            self.assertEqual(len(heap), 0)
+            with self.assertRaises(IndexError):
+                heap.replace_top(7)
+        heap = MaxHeap(4, key=itemgetter(0))
+        heap.add((5, "a"))
+        self.assertEqual(heap.pushpop((9, "b")), (9, "b"))
+        self.assertEqual(heap.pushpop((1, "c")), (5, "a"))
+        self.assertEqual(heap.replace_top((0, "d")), (1, "c"))
+        self.assertEqual(heap.peek(), (0, "d"))
+
+    def test_dary_heap_against_heapq(self):
+        for d in (2, 3, 4, 8):
+            RandomGen.set_seed(67)
+            heap, reference = DaryHeap(1, d=d), []
+            for _ in range(3000):
+                op = RandomGen.randint(0, 5)
+                if op < 2 and reference:
+                    self.assertEqual(heap.peek(), -reference[0])
+                    self.assertEqual(heap.get_max(), -heapq.heappop(reference))
+                elif op == 2 and reference:
+                    element = RandomGen.randint(0, 500)
+                    self.assertEqual(heap.pushpop(element), -heapq.heappushpop(reference, -element))
+                elif op == 3 and reference:
+                    element = RandomGen.randint(0, 500)
+                    self.assertEqual(heap.replace_top(element), -heapq.heapreplace(reference, -element))
+                else:
+                    element = RandomGen.randint(0, 500)
+                    heap.add(element)
+                    heapq.heappush(reference, -element)
+                self.assertEqual(len(heap), len(reference))
+            self.assertEqual(self.drain(heap), sorted((-x for x in reference), reverse=True))
+            with self.assertRaises(IndexError):
+                heap.get_max()
+            with self.assertRaises(IndexError):
+                heap.replace_top(1)
+        with self.assertRaises(ValueError):
+            DaryHeap(4, d=1)
+
+    def test_dary_heap_key_and_heapify(self):
+        RandomGen.set_seed(71)
+        priorities = [RandomGen.randint(0, 10**6) / 7 for _ in range(500)]
+        pairs = [(priority, i) for i, priority in enumerate(priorities)]
+        for d in (2, 3, 4, 8):
+            heap = DaryHeap(1, d=d, key=itemgetter(0))
+            for pair in pairs:
+                heap.add(pair)
+            self.assertEqual([priority for priority, _ in self.drain(heap)], sorted(priorities, reverse=True))
+            for n in (1, 2, d, d + 1, 500):
+                heap = DaryHeap.heapify(to_array(pairs[:n]), d=d, key=itemgetter(0))
+                self.assertEqual(len(heap), n)
+                self.assertEqual([priority for priority, _ in self.drain(heap)], sorted(priorities[:n], reverse=True))
+
+    def test_dary_heap_resizing(self):
+        RandomGen.set_seed(73)
+        items = random_ints(1000)
+        heap = DaryHeap(8, d=3, shrinkable=True)
+        for item in items:
+            heap.add(item)
+        self.assertEqual(heap.capacity, 1024)
+        self.assertEqual(heap.grow_count, 7)
+        self.assertEqual(len(heap.the_keys), heap.capacity)
+        self.assertEqual(self.drain(heap), sorted(items, reverse=True))
+        self.assertEqual(heap.capacity, 8)
+        self.assertEqual(heap.shrink_count, 7)
+        self.assertEqual(len(heap.the_keys), heap.capacity)
+
+        heap = DaryHeap(2, growable=False)
+        heap.add(1)
+        heap.add(2)
+        with self.assertRaises(IndexError):
+            heap.add(3)
+
+    def test_nlargest(self):
+        RandomGen.set_seed(79)
+        items = list(range(1000))
+        RandomGen.random_shuffle(items)
+        for k in (0, 1, 10, 999, 1000, 1500):
+            self.assertEqual(nlargest(iter(items), k), sorted(items, reverse=True)[:k])
+            self.assertEqual(nlargest(items, k, key=negated), sorted(items)[:k])
+        self.assertEqual(nlargest([], 3), [])
+
+    def test_top_k_merge(self):
+        RandomGen.set_seed(83)
+        items = random_ints(3000, 10**6)
+        expected = sorted(items, reverse=True)[:25]
+        # Split the stream between three workers, then merge their partial results.
+        workers = [TopK(25).extend(items[i::3]) for i in range(3)]
+        merged = TopK(25)
+        for worker in workers:
+            merged.merge(worker)
+        self.assertEqual(merged.results(), expected)
+        self.assertEqual(len(merged), 25)
+        # merge also accepts the results a worker sent back as a plain list.
+        merged = TopK(25).merge(workers[0].results()).merge(workers[1]).merge(iter(workers[2].results()))
+        self.assertEqual(merged.results(), expected)
+        self.assertEqual(TopK(25).merge(TopK(25)).results(), [])
+
+    def test_top_k_pickle(self):
+        RandomGen.set_seed(89)
+        items = random_ints(1000, 10**6)
+        for key in (None, negated):
+            top = TopK(10, key=key).extend(items)
+            copy = pickle.loads(pickle.dumps(top))
+            self.assertIsInstance(copy, TopK)
+            self.assertEqual((copy.k, copy.key), (10, key))
+            self.assertEqual(copy.results(), top.results())
+            # The copy keeps working, and can be merged back.
+            more = random_ints(100, 10**6)
+            copy.extend(more)
+            self.assertEqual(TopK(10, key=key).merge(copy).results(), nlargest(items + more, 10, key=key))
+        empty = pickle.loads(pickle.dumps(TopK(5)))
+        self.assertEqual(empty.results(), [])
+        # As documented, the key must be picklable itself.
+        with self.assertRaises((pickle.PicklingError, AttributeError)):
+            pickle.dumps(TopK(5, key=lambda x: x))
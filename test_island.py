@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from island import Island, IslandBatch
+from random_gen import RandomGen
+
+
+class IslandBatchTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "islands.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_matches_island_random(self):
+        batch = Island.random_batch(500, seed=123)
+        state = RandomGen.seed
+        RandomGen.set_seed(123)
+        islands = [Island.random() for _ in range(500)]
+        self.assertEqual(len(batch), 500)
+        self.assertEqual(batch.to_islands(), islands)
+        self.assertEqual([batch[i] for i in range(500)], islands)
+        # The generator is left where 500 calls to Island.random() leave it.
+        self.assertEqual(RandomGen.seed, state)
+
+        # Without a seed, the batch continues from the current state.
+        RandomGen.set_seed(7)
+        Island.random()
+        batch = Island.random_batch(20)
+        state = RandomGen.seed
+        RandomGen.set_seed(7)
+        Island.random()
+        self.assertEqual(batch.to_islands(), [Island.random() for _ in range(20)])
+        self.assertEqual(RandomGen.seed, state)
+
+    def test_write_read_round_trip(self):
+        batch = Island.random_batch(1000, seed=5, money_skew=2.5, zero_marine_fraction=0.1)
+        batch.write(self.path)
+        read = IslandBatch.read(self.path)
+        self.assertEqual(read.names, batch.names)
+        for column in ("name_ids", "money", "marines"):
+            self.assertEqual(getattr(read, column).typecode, getattr(batch, column).typecode)
+            self.assertEqual(getattr(read, column), getattr(batch, column))
+        self.assertEqual(read.to_islands(), batch.to_islands())
+
+        Island.random_batch(0, seed=5).write(self.path)
+        self.assertEqual(len(IslandBatch.read(self.path)), 0)
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a batch" * 10)
+        with self.assertRaises(ValueError):
+            IslandBatch.read(self.path)
+
+    def test_money_skew(self):
+        for money_skew in (0, -1.5):
+            with self.assertRaises(ValueError):
+                Island.random_batch(10, seed=1, money_skew=money_skew)
+        uniform = Island.random_batch(2000, seed=3)
+        skewed = Island.random_batch(2000, seed=3, money_skew=3.0)
+        self.assertTrue(all(0 <= money < 500 * 2**32 for money in skewed.money))
+        # u**3 has mean 1/4, against 1/2 for u.
+        self.assertLess(sum(skewed.money) / 2000, 0.6 * sum(uniform.money) / 2000)
+        # The skew only changes money.
+        self.assertEqual(skewed.name_ids, uniform.name_ids)
+        self.assertEqual(skewed.marines, uniform.marines)
+
+    def test_zero_marine_fraction(self):
+        self.assertEqual(Island.random_batch(200, seed=9, zero_marine_fraction=0.0).to_islands(),
+                         Island.random_batch(200, seed=9).to_islands())
+        self.assertEqual(set(Island.random_batch(200, seed=9, zero_marine_fraction=1.0).marines), {0})
+        batch = Island.random_batch(4000, seed=9, zero_marine_fraction=0.25)
+        zeros = sum(1 for marines in batch.marines if marines == 0)
+        self.assertTrue(900 <= zeros <= 1100, zeros)
+        self.assertTrue(all(0 <= marines <= 300 for marines in batch.marines))
@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from data_structures.hash_table import string_hash
+from data_structures.mmap_table import MmapTable
+
+
+def clashing_hash(key: str) -> int:
+    """ Sends every key with the same first letter to the same home slot. """
+    return ord(key[0])
+
+
+class MmapTableTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "table.lpt")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_get_set_contains(self):
+        with MmapTable.create(self.path) as table:
+            table["Dawn Island"] = b"400"
+            table["Zou"] = b""
+            table["Wano Country ☀"] = b"\x00\x01"
+            self.assertEqual(len(table), 3)
+            self.assertEqual(table["Dawn Island"], b"400")
+            self.assertEqual(table["Zou"], b"")
+            self.assertEqual(table["Wano Country ☀"], b"\x00\x01")
+            self.assertIn("Zou", table)
+            self.assertNotIn("Jaya", table)
+            with self.assertRaises(KeyError):
+                _ = table["Jaya"]
+            with self.assertRaises(KeyError):
+                del table["Jaya"]
+
+    def test_close_and_reopen(self):
+        expected = {f"island-{i}": str(i * i).encode() for i in range(200)}
+        with MmapTable.create(self.path) as table:
+            for key, value in expected.items():
+                table[key] = value
+            del table["island-7"]
+        del expected["island-7"]
+
+        with MmapTable(self.path) as table:
+            self.assertEqual(len(table), len(expected))
+            self.assertEqual(dict(table.items()), expected)
+            table["island-7"] = b"back"
+        with MmapTable(self.path) as table:
+            self.assertEqual(table["island-7"], b"back")
+            self.assertEqual(len(table), len(expected) + 1)
+
+    def test_growth_replaces_file(self):
+        with MmapTable.create(self.path) as table:
+            first_size = table.table_size
+            for i in range(1000):
+                table[str(i)] = b"v" * (i % 50)
+            self.assertGreater(table.table_size, first_size)
+            self.assertLessEqual(len(table), table.table_size * table.MAX_LOAD_FACTOR)
+            for i in range(1000):
+                self.assertEqual(table[str(i)], b"v" * (i % 50))
+        self.assertFalse(os.path.exists(self.path + ".rehash"))
+        with MmapTable(self.path) as table:
+            self.assertEqual(len(table), 1000)
+            self.assertEqual(sorted(table.keys(), key=int), [str(i) for i in range(1000)])
+
+    def test_rehash_drops_garbage(self):
+        with MmapTable.create(self.path, expected=100) as table:
+            for i in range(40):
+                table[f"k{i}"] = b"x" * 100
+            for i in range(40):
+                table[f"k{i}"] = b"y" * 200
+            garbage_used = table.heap_used
+            for i in range(40, 60):
+                table[f"k{i}"] = b"z"
+            table._rehash()
+            self.assertLess(table.heap_used, garbage_used)
+            for i in range(40):
+                self.assertEqual(table[f"k{i}"], b"y" * 200)
+
+    def test_garbage_is_compacted(self):
+        with MmapTable.create(self.path) as table:
+            table["other"] = b"kept"
+            for i in range(2000):
+                table["key"] = str(i).encode() * (1 + i % 3)
+            table["k0"] = b""
+            size = table.table_size
+            for i in range(2000):
+                table[f"k{i % 20 + 1}"] = b"x" * 40
+                del table[f"k{i % 20 + 1}"]
+            self.assertEqual(table.table_size, size)
+            self.assertLessEqual(table.heap_used, 2 * MmapTable.MIN_HEAP_CAPACITY)
+            # Heaps up to MIN_HEAP_CAPACITY are left alone, bigger ones are at most half garbage.
+            self.assertTrue(table.heap_used <= MmapTable.MIN_HEAP_CAPACITY or 2 * table.heap_garbage <= table.heap_used)
+            self.assertEqual(table["key"], b"1999" * 2)
+            self.assertEqual(table["other"], b"kept")
+            garbage = table.heap_garbage
+        with MmapTable(self.path) as table:
+            self.assertEqual(table.heap_garbage, garbage)
+            self.assertEqual(len(table), 3)
+
+    def test_delete_replaces_cluster(self):
+        keys = ["a1", "a2", "b1", "a3", "b2", "a4", "c1"]
+        with MmapTable.create(self.path, expected=20, hash_function=clashing_hash) as table:
+            for key in keys:
+                table[key] = key.encode()
+            for removed in ["a1", "b1", "a3"]:
+                del table[removed]
+                keys.remove(removed)
+                self.assertEqual(len(table), len(keys))
+                for key in keys:
+                    self.assertEqual(table[key], key.encode())
+                self.assertNotIn(removed, table)
+            # Deleting left no gap in a cluster: every key is still found by probing.
+            table["a1"] = b"again"
+            self.assertEqual(table["a1"], b"again")
+
+    def test_update_in_place_or_append(self):
+        with MmapTable.create(self.path) as table:
+            table["key"] = b"long value"
+            used = table.heap_used
+            table["key"] = b"short"
+            self.assertEqual(table.heap_used, used)
+            self.assertEqual(table["key"], b"short")
+            table["key"] = b"a much longer value than before"
+            self.assertGreater(table.heap_used, used)
+            self.assertEqual(table["key"], b"a much longer value than before")
+            self.assertEqual(len(table), 1)
+
+    def test_heap_grows(self):
+        big = b"#" * (3 * MmapTable.MIN_HEAP_CAPACITY)
+        with MmapTable.create(self.path) as table:
+            table["small"] = b"s"
+            table["big"] = big
+            self.assertGreaterEqual(table.heap_capacity, table.heap_used)
+            self.assertEqual(table["big"], big)
+            self.assertEqual(table["small"], b"s")
+        with MmapTable(self.path) as table:
+            self.assertEqual(table["big"], big)
+
+    def test_not_a_table(self):
+        open(self.path, "wb").close()
+        with self.assertRaises(ValueError):
+            MmapTable(self.path)
+        with open(self.path, "wb") as f:
+            f.write(b"not a table" * 10)
+        with self.assertRaises(ValueError):
+            MmapTable(self.path)
+
+    def test_hash_out_of_range(self):
+        with MmapTable.create(self.path, hash_function=lambda key: -string_hash(key) - 1) as table:
+            with self.assertRaises(ValueError):
+                table["Dawn Island"] = b"400"
+            with self.assertRaises(ValueError):
+                _ = table["Dawn Island"]
+            self.assertEqual(len(table), 0)
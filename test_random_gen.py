@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from data_structures.dynamic_array import DynamicArrayR
+from data_structures.referential_array import ArrayR
+from random_gen import RandomGen
+
+
+class RandomGenTests(TestCase):
+
+    def test_shuffle_same_permutation(self):
+        """ The bulk path for lists and ArrayRs and the element-by-element one shuffle alike. """
+        n = 200
+        RandomGen.set_seed(4)
+        expected = list(range(n))
+        RandomGen.random_shuffle(expected)
+        self.assertEqual(sorted(expected), list(range(n)))
+
+        array = ArrayR(n)
+        dynamic = DynamicArrayR()
+        for i in range(n):
+            array[i] = i
+            dynamic.append(i)
+        for collection in (array, dynamic):
+            RandomGen.set_seed(4)
+            RandomGen.random_shuffle(collection)
+            self.assertEqual([collection[i] for i in range(n)], expected)
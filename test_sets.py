@@ -0,0 +1,104 @@
+from unittest import TestCase
+
+from data_structures.bitset import BitSet
+from data_structures.hset import HSet
+from data_structures.set import Set
+from random_gen import RandomGen
+
+
+class SetTests(TestCase):
+
+    def random_updates(self, the_set: Set, expected: set, n_ops: int, n_items: int) -> None:
+        """ Apply random adds and removes to the_set and to a Python set, comparing them throughout. """
+        for _ in range(n_ops):
+            item = RandomGen.randint(0, n_items - 1)
+            if RandomGen.randint(0, 2) == 0:
+                if item in expected:
+                    the_set.remove(item)
+                    expected.remove(item)
+                else:
+                    with self.assertRaises(KeyError):
+                        the_set.remove(item)
+            else:
+                the_set.add(item)
+                expected.add(item)
+            self.assertEqual(len(the_set), len(expected))
+            self.assertEqual(item in the_set, item in expected)
+
+    def check_set(self, the_set: Set, expected: set) -> None:
+        self.assertEqual(len(the_set), len(expected))
+        self.assertEqual(the_set.is_empty(), not expected)
+        self.assertEqual(sorted(the_set), sorted(expected))
+
+    def check_algebra(self, make_set, n_items_a: int, n_items_b: int) -> None:
+        """ Build two random sets with make_set(n_items) and check union, intersection and difference. """
+        a, expected_a = make_set(n_items_a), set()
+        b, expected_b = make_set(n_items_b), set()
+        self.random_updates(a, expected_a, 300, n_items_a)
+        self.random_updates(b, expected_b, 300, n_items_b)
+        self.check_set(a.union(b), expected_a | expected_b)
+        self.check_set(b.union(a), expected_a | expected_b)
+        self.check_set(a.intersection(b), expected_a & expected_b)
+        self.check_set(b.intersection(a), expected_a & expected_b)
+        self.check_set(a.difference(b), expected_a - expected_b)
+        self.check_set(b.difference(a), expected_b - expected_a)
+        # The operands are left unchanged.
+        self.check_set(a, expected_a)
+        self.check_set(b, expected_b)
+
+    def test_hset(self):
+        RandomGen.set_seed(17)
+        the_set, expected = HSet(), set()
+        for _ in range(5):
+            self.random_updates(the_set, expected, 500, 200)
+            self.check_set(the_set, expected)
+        with self.assertRaises(KeyError):
+            HSet().remove(1)
+        words = HSet(hash_function=len)
+        for word in ["Zou", "Jaya", "Zou", "Water 7"]:
+            words.add(word)
+        self.check_set(words, {"Zou", "Jaya", "Water 7"})
+        words.clear()
+        self.check_set(words, set())
+
+    def test_hset_algebra(self):
+        RandomGen.set_seed(19)
+        self.check_algebra(lambda n_items: HSet(), 100, 100)
+        self.check_algebra(lambda n_items: HSet(), 30, 300)
+        self.check_set(HSet().union(HSet()), set())
+
+    def test_bitset(self):
+        RandomGen.set_seed(23)
+        for universe in (1, 63, 64, 65, 200):
+            the_set, expected = BitSet(universe), set()
+            for _ in range(5):
+                self.random_updates(the_set, expected, 300, universe)
+                self.check_set(the_set, expected)
+                # Iteration is in increasing order.
+                self.assertEqual(list(the_set), sorted(expected))
+            self.assertNotIn(-1, the_set)
+            self.assertNotIn(universe, the_set)
+            for item in (-1, universe):
+                with self.assertRaises(ValueError):
+                    the_set.add(item)
+                with self.assertRaises(KeyError):
+                    the_set.remove(item)
+            the_set.clear()
+            self.check_set(the_set, set())
+        with self.assertRaises(ValueError):
+            BitSet(0)
+
+    def test_bitset_algebra(self):
+        RandomGen.set_seed(29)
+        self.check_algebra(BitSet, 200, 200)
+        # Different universes on each side, including ones within a word of each other.
+        for universe_a, universe_b in ((64, 300), (300, 64), (10, 130), (65, 64), (1, 1000)):
+            self.check_algebra(BitSet, universe_a, universe_b)
+        a, b = BitSet(10), BitSet(1000)
+        a.add(3)
+        b.add(3)
+        b.add(999)
+        self.assertEqual(a.union(b).universe, 1000)
+        self.assertEqual(a.intersection(b).universe, 10)
+        self.assertEqual(b.difference(a).universe, 1000)
+        self.check_set(b.difference(a), {999})
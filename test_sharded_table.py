@@ -0,0 +1,142 @@
+import sys
+from threading import Thread
+from unittest import TestCase
+
+from data_structures.sharded_table import ShardedTable
+from random_gen import RandomGen
+
+
+def f(key: int) -> str:
+    """ The value every writer stores at key. """
+    return "value-{0}".format(key)
+
+
+class ShardedTableTests(TestCase):
+
+    def setUp(self):
+        # Switch threads as often as possible, so readers see writers mid-change.
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_against_dict(self, table: ShardedTable) -> None:
+        RandomGen.set_seed(31)
+        expected = {}
+        for i in range(3000):
+            key = RandomGen.randint(0, 400)
+            op = RandomGen.randint(0, 2)
+            if op == 0:
+                table[key] = i
+                expected[key] = i
+            elif op == 1:
+                if key in expected:
+                    del table[key]
+                    del expected[key]
+                else:
+                    with self.assertRaises(KeyError):
+                        del table[key]
+            else:
+                self.assertEqual(key in table, key in expected)
+                if key in expected:
+                    self.assertEqual(table[key], expected[key])
+                else:
+                    with self.assertRaises(KeyError):
+                        _ = table[key]
+            self.assertEqual(len(table), len(expected))
+        self.assertEqual(sorted(table.items()), sorted(expected.items()))
+        self.assertEqual(sorted(table.keys()), sorted(expected))
+        self.assertEqual(sorted(table.values()), sorted(expected.values()))
+
+    def test_single_threaded(self):
+        self.run_against_dict(ShardedTable())
+        self.run_against_dict(ShardedTable(n_shards=1))
+        self.run_against_dict(ShardedTable(n_shards=3, incremental_rehash=True))
+        with self.assertRaises(ValueError):
+            ShardedTable(n_shards=0)
+
+    def run_threads(self, table: ShardedTable) -> None:
+        """
+        Writers insert, delete and re-insert their own keys, always storing f(key), while
+        readers check that every successful read returns f(key), and that the keys that
+        are never deleted are always found.
+        """
+        n_writers, keys_per_writer, n_readers = 4, 500, 4
+        stable = range(-100, 0)
+        for key in stable:
+            table[key] = f(key)
+        errors = []
+
+        def writer(first: int) -> None:
+            keys = range(first, first + keys_per_writer)
+            try:
+                for _ in range(3):
+                    for key in keys:
+                        table[key] = f(key)
+                    for key in keys[::2]:
+                        del table[key]
+                    for key in keys[::2]:
+                        table[key] = f(key)
+                    for key in keys:
+                        del table[key]
+            except Exception as e:
+                errors.append(e)
+
+        def reader(seed: int) -> None:
+            state = seed
+            try:
+                for _ in range(20000):
+                    state = (1103515245 * state + 12345) % 2**31
+                    key = state % (n_writers * keys_per_writer + len(stable)) - len(stable)
+                    try:
+                        value = table[key]
+                    except KeyError:
+                        if key < 0:
+                            errors.append(AssertionError("stable key {0} not found".format(key)))
+                        continue
+                    if value != f(key):
+                        errors.append(AssertionError("read {0!r} for key {1}".format(value, key)))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=writer, args=(i * keys_per_writer,)) for i in range(n_writers)]
+        threads += [Thread(target=reader, args=(i + 1,)) for i in range(n_readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(table.items()), [(key, f(key)) for key in stable])
+
+    def test_threaded(self):
+        self.run_threads(ShardedTable(n_shards=4))
+
+    def test_threaded_incremental_rehash(self):
+        self.run_threads(ShardedTable(n_shards=4, incremental_rehash=True))
+
+    def read_while_locked(self, table: ShardedTable, key: int) -> bool:
+        """ Read key in another thread while its shard's lock is held: True if the read finished without waiting for the lock. """
+        results = []
+        lock = table.locks[table._shard_index(key)]
+        with lock:
+            thread = Thread(target=lambda: results.append(table[key]), daemon=True)
+            thread.start()
+            thread.join(0.2)
+            finished = not thread.is_alive()
+        thread.join()
+        self.assertEqual(results, [f(key)])
+        return finished
+
+    def test_lock_free_reads(self):
+        table = ShardedTable(n_shards=4)
+        table[7] = f(7)
+        self.assertTrue(table.lock_free_reads)
+        # The read does not need the lock held by another thread.
+        self.assertTrue(self.read_while_locked(table, 7))
+
+        table = ShardedTable(n_shards=4, incremental_rehash=True)
+        table[7] = f(7)
+        self.assertFalse(table.lock_free_reads)
+        # Reads wait for the lock while a table is rehashing incrementally.
+        self.assertFalse(self.read_while_locked(table, 7))
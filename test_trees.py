@@ -0,0 +1,231 @@
+from unittest import TestCase
+
+from data_structures.avl import AVLTree
+from data_structures.bplus_tree import BPlusInternal, BPlusTree
+from data_structures.bst import BSTPostOrderIterator, BSTPreOrderIterator, BinarySearchTree
+from data_structures.node import AVLTreeNode
+from data_structures.persistent_bst import PersistentBST
+from random_gen import RandomGen
+
+
+class TreeTests(TestCase):
+
+    def check_tree(self, tree: BinarySearchTree, expected: dict) -> None:
+        """ Check the contents of tree against expected, and the size (and, for AVL trees, height) invariants. """
+        self.assertEqual(len(tree), len(expected))
+        self.assertEqual([(node.key, node.item) for node in tree], sorted(expected.items()))
+        self.check_node(tree, tree.root)
+
+    def check_node(self, tree: BinarySearchTree, current) -> int:
+        """ Check the sub-tree of current, returning its height. """
+        if current is None:
+            return 0
+        left_height = self.check_node(tree, current.left)
+        right_height = self.check_node(tree, current.right)
+        if current.left is not None:
+            self.assertLess(current.left.key, current.key)
+        if current.right is not None:
+            self.assertGreater(current.right.key, current.key)
+        self.assertEqual(current.size, 1 + tree.get_size(current.left) + tree.get_size(current.right))
+        if isinstance(tree, AVLTree):
+            self.assertIsInstance(current, AVLTreeNode)
+            self.assertEqual(current.height, 1 + max(left_height, right_height))
+            self.assertLessEqual(abs(left_height - right_height), 1)
+        return 1 + max(left_height, right_height)
+
+    def random_updates(self, tree: BinarySearchTree, expected: dict, n_ops: int, n_keys: int) -> None:
+        for i in range(n_ops):
+            key = RandomGen.randint(0, n_keys)
+            if key in expected:
+                if RandomGen.randint(0, 1):
+                    del tree[key]
+                    del expected[key]
+                else:
+                    with self.assertRaises(ValueError):
+                        tree[key] = i
+            else:
+                tree[key] = i
+                expected[key] = i
+
+    def test_random_updates(self):
+        for tree_type in (BinarySearchTree, AVLTree, PersistentBST):
+            RandomGen.set_seed(3)
+            tree, expected = tree_type(), {}
+            for _ in range(10):
+                self.random_updates(tree, expected, 100, 200)
+                self.check_tree(tree, expected)
+            with self.assertRaises(ValueError):
+                del tree[-1]
+            with self.assertRaises(KeyError):
+                _ = tree[-1]
+
+    def test_failed_updates_leave_sizes(self):
+        for tree_type in (BinarySearchTree, AVLTree, PersistentBST):
+            tree = tree_type()
+            for key in [5, 3, 8, 1, 4]:
+                tree[key] = key
+            for update in (lambda: tree.__setitem__(None, 0), lambda: tree.__delitem__(None),
+                           lambda: tree.insert_iterative(4, 0), lambda: tree.delete_iterative(7)):
+                with self.assertRaises((TypeError, ValueError)):
+                    update()
+                self.check_tree(tree, {key: key for key in [5, 3, 8, 1, 4]})
+
+    def test_avl_sorted_inserts_stay_balanced(self):
+        tree = AVLTree()
+        for key in range(1000):
+            tree[key] = str(key)
+        self.check_tree(tree, {key: str(key) for key in range(1000)})
+        self.assertLessEqual(tree.get_height(tree.root), 15)
+
+    def test_iterative_updates(self):
+        for tree_type in (BinarySearchTree, AVLTree, PersistentBST):
+            tree = tree_type()
+            for key in range(100):
+                tree.insert_iterative(key, str(key))
+            for key in range(0, 100, 3):
+                tree.delete_iterative(key)
+            self.check_tree(tree, {key: str(key) for key in range(100) if key % 3})
+            if tree_type is not BinarySearchTree:
+                self.assertLessEqual(tree.get_height(tree.root), 10)
+
+    def test_order_statistics(self):
+        keys = list(range(0, 200, 2))
+        RandomGen.set_seed(9)
+        RandomGen.random_shuffle(keys)
+        for tree_type in (BinarySearchTree, AVLTree, PersistentBST):
+            tree = tree_type()
+            for key in keys:
+                tree[key] = key
+            self.check_tree(tree, {key: key for key in keys})
+            self.assertEqual(tree.kth(1).key, 0)
+            self.assertEqual(tree.kth(100).key, 198)
+            with self.assertRaises(IndexError):
+                tree.kth(101)
+            with self.assertRaises(IndexError):
+                tree.kth(0)
+            self.assertEqual(tree.rank(51), 26)
+            self.assertEqual(tree.rank(-1), 0)
+            self.assertEqual(tree.count_range(10, 20), 6)
+            self.assertEqual(tree.count_range(20, 10), 0)
+            self.assertEqual(list(tree.range_items(9, 15)), [(10, 10), (12, 12), (14, 14)])
+
+    def test_bulk_construction(self):
+        for tree_type in (BinarySearchTree, AVLTree, PersistentBST):
+            tree = tree_type.from_sorted((key, str(key)) for key in range(100))
+            self.check_tree(tree, {key: str(key) for key in range(100)})
+            # Perfectly balanced: 100 keys fit in 7 levels.
+            self.assertEqual(self.check_node(tree, tree.root), 7)
+            pairs = [(key, key) for key in range(0, 300, 3)]
+            RandomGen.set_seed(2)
+            RandomGen.random_shuffle(pairs)
+            tree = tree_type.from_unsorted(pairs)
+            self.check_tree(tree, dict(pairs))
+            tree[1] = 1
+            self.assertEqual(tree.kth(2).key, 1)
+            self.assertEqual(len(tree_type.from_sorted([])), 0)
+            with self.assertRaises(ValueError):
+                tree_type.from_sorted([(2, 2), (1, 1)])
+            with self.assertRaises(ValueError):
+                tree_type.from_unsorted([(1, 1), (0, 0), (1, 2)])
+
+    def test_iterators(self):
+        tree = BinarySearchTree()
+        for key in [50, 30, 70, 20, 40, 60, 80]:
+            tree[key] = key
+        self.assertEqual([node.key for node in BSTPreOrderIterator(tree.root)], [50, 30, 20, 40, 70, 60, 80])
+        self.assertEqual([node.key for node in tree], [20, 30, 40, 50, 60, 70, 80])
+        self.assertEqual([node.key for node in BSTPostOrderIterator(tree.root)], [20, 40, 30, 60, 80, 70, 50])
+        self.assertEqual([node.key for node in tree.iter_from(45)], [50, 60, 70, 80])
+        self.assertEqual([node.key for node in tree.iter_from(50)], [50, 60, 70, 80])
+        self.assertEqual([node.key for node in tree.iter_from(0)], [20, 30, 40, 50, 60, 70, 80])
+        self.assertEqual(list(tree.iter_from(81)), [])
+        empty = BinarySearchTree()
+        for iterator in (BSTPreOrderIterator(empty.root), iter(empty), BSTPostOrderIterator(empty.root), empty.iter_from(0)):
+            self.assertEqual(list(iterator), [])
+
+    def test_split_and_join(self):
+        for tree_type in (BinarySearchTree, AVLTree, PersistentBST):
+            RandomGen.set_seed(5)
+            for split_key in (-1, 0, 57, 100, 250):
+                tree, expected = tree_type(), {}
+                self.random_updates(tree, expected, 300, 200)
+                left, right = tree.split(split_key)
+                self.assertEqual(len(tree), 0)
+                self.check_tree(left, {k: v for k, v in expected.items() if k < split_key})
+                self.check_tree(right, {k: v for k, v in expected.items() if k >= split_key})
+                joined = tree_type.join(left, right)
+                self.check_tree(joined, expected)
+                self.assertEqual(len(left) + len(right), 0)
+
+    def test_join_uneven_avl(self):
+        left = AVLTree.from_sorted((key, key) for key in range(3))
+        right = AVLTree.from_sorted((key, key) for key in range(10, 1000))
+        joined = AVLTree.join(left, right)
+        self.check_tree(joined, {key: key for key in [*range(3), *range(10, 1000)]})
+        with self.assertRaises(ValueError):
+            AVLTree.join(AVLTree.from_sorted([(5, 5)]), AVLTree.from_sorted([(1, 1)]))
+
+    def test_delete_range(self):
+        for tree_type in (BinarySearchTree, AVLTree, PersistentBST):
+            tree = tree_type.from_sorted((key, key) for key in range(100))
+            tree.delete_range(20, 79)
+            self.check_tree(tree, {key: key for key in [*range(20), *range(80, 100)]})
+            tree.delete_range(50, 40)
+            self.assertEqual(len(tree), 40)
+
+    def test_persistent_snapshots(self):
+        RandomGen.set_seed(11)
+        tree, expected = PersistentBST(), {}
+        snapshots = []
+        for _ in range(8):
+            self.random_updates(tree, expected, 60, 100)
+            snapshots.append((tree.snapshot(), dict(expected)))
+        tree.delete_range(0, 50)
+        left, right = tree.split(75)
+        PersistentBST.join(left, right)
+        for snapshot, snapshot_expected in snapshots:
+            self.check_tree(snapshot, snapshot_expected)
+
+    def check_bplus_node(self, tree: BPlusTree, node, lo, hi, is_root: bool) -> int:
+        """ Check that the keys of node are sorted, within [lo, hi) and fill it enough, returning its height. """
+        keys = node.keys
+        self.assertEqual(keys, sorted(keys))
+        self.assertLessEqual(len(keys), tree.node_capacity)
+        if not is_root:
+            self.assertGreaterEqual(len(keys), tree.min_count)
+        if keys:
+            self.assertTrue(lo is None or lo <= keys[0])
+            self.assertTrue(hi is None or keys[-1] < hi)
+        if not isinstance(node, BPlusInternal):
+            self.assertEqual(len(node.items), len(keys))
+            return 1
+        self.assertEqual(len(node.children), len(keys) + 1)
+        bounds = [lo, *keys, hi]
+        heights = {self.check_bplus_node(tree, child, bounds[i], bounds[i + 1], False)
+                   for i, child in enumerate(node.children)}
+        self.assertEqual(len(heights), 1)
+        return 1 + heights.pop()
+
+    def test_bplus_tree(self):
+        for capacity in (3, 4, 32):
+            RandomGen.set_seed(13)
+            tree, expected = BPlusTree(capacity), {}
+            for _ in range(10):
+                self.random_updates(tree, expected, 300, 500)
+                self.assertEqual(len(tree), len(expected))
+                self.assertEqual([(node.key, node.item) for node in tree], sorted(expected.items()))
+                self.check_bplus_node(tree, tree.root, None, None, True)
+            for key in range(-1, 502):
+                self.assertEqual(key in tree, key in expected)
+            with self.assertRaises(ValueError):
+                del tree[-1]
+            with self.assertRaises(KeyError):
+                _ = tree[-1]
+            self.assertEqual(list(tree.range_items(100, 150)),
+                             sorted((k, v) for k, v in expected.items() if 100 <= k <= 150))
+            for key in list(expected):
+                del tree[key]
+            self.assertTrue(tree.is_empty())
+            self.assertEqual(list(tree), [])
+        with self.assertRaises(ValueError):
+            BPlusTree(2)